@@ -0,0 +1,7 @@
+#!/usr/bin/env python3
+# Kept for existing cron jobs and habits, equivalent to "python -m netman bench"
+
+import sys
+from netman.cli import main
+
+sys.exit(main(["bench"] + sys.argv[1:]))
@@ -0,0 +1,7 @@
+#!/usr/bin/env python3
+# Kept for existing cron jobs and habits, equivalent to "python -m netman push"
+
+import sys
+from netman.cli import main
+
+sys.exit(main(["push"] + sys.argv[1:]))
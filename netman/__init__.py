@@ -0,0 +1,2 @@
+# NetMan - network management scripts for SNMP inventory, DHCP provisioning, pcap analysis and config backups
+# Submodules are imported on demand so "import netman" stays cheap
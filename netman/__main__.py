@@ -0,0 +1,4 @@
+import sys
+from netman.cli import main
+
+sys.exit(main())
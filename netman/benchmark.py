@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+# Dependencies that must only be imported by the subcommands that need them
+heavy_modules = ("matplotlib", "scapy", "netmiko", "paramiko", "git", "easysnmp", "numpy")
+
+# Module -> heavy dependencies it is allowed to import at load time
+import_allowances = {
+    "netman.cli": (),
+    "netman.snmp": (),
+    "netman.rates": ("numpy",),
+    "netman.tcpdump": ("numpy",),
+    "netman.parsers": (),
+    "netman.sshpool": (),
+    "netman.push": (),
+    "netman.resolver": (),
+    "netman.dhcp": (),
+    "netman.github": (),
+    "netman.metrics": (),
+    "netman.simulator": (),
+    "netman.benchmark": ()
+}
+import_budget_ms = 200  # Slowest acceptable import of a single netman module
+
+# Function to time a callable, returning the best of several runs in seconds
+def best_time(func, *args, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+# Function to build a synthetic "show ipv6 neighbors" output with the given number of rows
+def synthetic_neighbors(lines):
+    rows = ["IPv6 Address                              Age Link-layer Addr State Interface"]
+    states = ("REACH", "STALE", "DELAY", "PROBE")
+    for i in range(lines):
+        mac = f"ca{i >> 16 & 0xff:02x}.{i >> 8 & 0xff:02x}{i & 0xff:02x}.0000"
+        ipv6 = f"2001:DB8:{i >> 16:X}:{i & 0xffff:X}::1" if i % 2 else f"FE80::C8{i & 0xff:02X}:4CFF:FE{i >> 8 & 0xff:02X}:0"
+        age = "-" if i % 50 == 0 else str(random.randint(0, 240))
+        rows.append(f"{ipv6:<42}{age:>3} {mac}  {states[i % 4]} Gi0/{i % 48}")
+    return "\n".join(rows) + "\n"
+
+# Function to build a synthetic "show ip dhcp binding" output with the given number of leases
+def synthetic_dhcp_bindings(lines):
+    rows = [
+        "Bindings from all pools not associated with VRF:",
+        "IP address          Client-ID/              Lease expiration        Type",
+        "                    Hardware address/",
+        "                    User name"
+    ]
+    for i in range(lines):
+        ip = f"10.{i >> 16 & 0xff}.{i >> 8 & 0xff}.{i & 0xff}"
+        if i % 10 == 0:  # Text client IDs wrap over several lines
+            rows.append(f"{ip:<20}0063.6973.636f.2d63.    Mar 02 2025 12:00 AM    Automatic")
+            rows.append("                    6130.342e.3463.3663.")
+            rows.append("                    302f.30")
+        else:
+            rows.append(f"{ip:<20}01ca.{i >> 8 & 0xff:02x}{i & 0xff:02x}.0000.00       Infinite                Manual")
+    return "\n".join(rows) + "\n"
+
+# Benchmark of the CLI output parsers
+def bench_parsers(lines):
+    from netman.parsers import parse_dhcp_bindings, parse_ipv6_neighbors
+
+    for name, build, parse in (
+        ("show ipv6 neighbors", synthetic_neighbors, parse_ipv6_neighbors),
+        ("show ip dhcp binding", synthetic_dhcp_bindings, parse_dhcp_bindings)
+    ):
+        output = build(lines)
+        records = len(parse(output))
+        elapsed = best_time(parse, output)
+        line_count = output.count("\n")
+        print(f"{name:<22} {line_count:>8} lines {records:>8} records {elapsed * 1000:8.1f} ms "
+              f"{line_count / elapsed:>12,.0f} lines/s")
+
+# Function to build a synthetic running-config of a device
+def synthetic_config(device, revision, interfaces=48):
+    lines = [
+        "Building configuration...",
+        "",
+        f"Current configuration : {4000 + revision} bytes",
+        f"! Last configuration change at {revision % 24:02d}:00:00 UTC",
+        f"hostname {device}",
+        f"ntp clock-period {17179000 + revision}"
+    ]
+    for i in range(interfaces):
+        lines += [f"interface GigabitEthernet0/{i}", f" description uplink-{i}-rev{revision if i == 0 else 0}", " no shutdown", "!"]
+    return "\n".join(lines) + "\n"
+
+# Function to measure the size of a directory tree in bytes
+def tree_size(path):
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)
+
+# Benchmark of the config backup commit and push path against a local bare remote
+def bench_git(devices, cycles, changed, collectors):
+    from git import Repo
+    from netman.github import PushCoalescer, backup_cycle, create_initial_commit, push_changes
+
+    with tempfile.TemporaryDirectory() as tmp:
+        remote_dir = os.path.join(tmp, "remote.git")
+        Repo.init(remote_dir, bare=True)  # Offline stand-in for GitHub
+        repo = Repo.init(os.path.join(tmp, "work"))
+        with repo.config_writer() as config:
+            config.set_value("user", "name", "netman-bench")
+            config.set_value("user", "email", "netman-bench@localhost")
+        repo.create_remote("origin", remote_dir)
+        create_initial_commit(repo)
+
+        revisions = {f"R{i}": 0 for i in range(devices)}
+        print(f"{'cycle':>6} {'changed':>8} {'commit ms':>10} {'push ms':>9} {'repo MB':>8}")
+        for cycle in range(cycles):
+            for device in random.sample(sorted(revisions), min(changed, devices)) if cycle else revisions:
+                revisions[device] += 1  # First cycle backs up every device
+            configs = {device: synthetic_config(device, revision) for device, revision in revisions.items()}
+
+            start = time.perf_counter()
+            backup_cycle(repo, configs, push=False)
+            commit_time = time.perf_counter() - start
+            start = time.perf_counter()
+            push_changes(repo, "main", remote_url=remote_dir)
+            push_time = time.perf_counter() - start
+            if cycle == 0 or (cycle + 1) % max(cycles // 10, 1) == 0:
+                print(f"{cycle + 1:>6} {len(configs) if cycle == 0 else changed:>8} {commit_time * 1000:>10.1f} "
+                      f"{push_time * 1000:>9.1f} {tree_size(repo.git_dir) / 1e6:>8.1f}")
+
+        # Many collectors committing at once, with their pushes coalesced
+        pusher = PushCoalescer(repo, "main", remote_url=remote_dir, debounce=0.2, max_delay=2)
+        commit_lock = threading.Lock()  # One index, so commits are serialized
+
+        def collector(worker):
+            for round_number in range(3):
+                with commit_lock:
+                    device = f"R{worker % devices}"
+                    revisions[device] += 1
+                    backup_cycle(repo, {device: synthetic_config(device, revisions[device])}, pusher=pusher)
+                time.sleep(0.05)
+
+        threads = [threading.Thread(target=collector, args=(worker,)) for worker in range(collectors)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        pusher.flush()
+        print(f"{collectors} collectors: {pusher.requests} push requests coalesced into {pusher.pushes} push(es) "
+              f"in {time.perf_counter() - start:.2f}s")
+
+# Function to list the routers whose collected data differs from what their simulated agent serves
+def verify_collection(network_data, interface_status, fleet):
+    import ipaddress
+
+    mismatches = []
+    for agent in fleet.agents.values():
+        addresses = {}
+        statuses = {}
+        for interface in agent.interfaces:
+            name = interface.get("name") or f"Interface-{interface['if_index']}"
+            if interface.get("v4"):
+                addresses.setdefault(name, {})["v4"] = interface["v4"]
+            if interface.get("v6"):
+                addresses.setdefault(name, {})["v6"] = sorted(ipaddress.IPv6Address(address).exploded for address in interface["v6"])
+            if interface.get("status"):
+                statuses[name] = interface["status"]
+        collected = {name: {family: sorted(value) if family == "v6" else value for family, value in families.items()}
+                     for name, families in network_data.get(agent.name, {}).get("addresses", {}).items()}
+        if collected != addresses or interface_status.get(agent.name) != statuses:
+            mismatches.append(agent.name)  # Exact match, so a wrong ifIndex join shows up as a misplaced address
+    return mismatches
+
+# Benchmark of the SNMP collection path against a simulated agent fleet
+def bench_snmp(devices, interfaces, latency, workers, cycles, fixture):
+    from netman import snmp
+    from netman.simulator import build_fleet
+
+    fleet = build_fleet(devices, interfaces, latency, fixture)
+    fleet.install()
+    expected_interfaces = sum(len(agent.columns.get(snmp.oid_ifname, ())) for agent in fleet.agents.values())
+    print(f"{len(fleet.agents)} simulated routers, {expected_interfaces} named interfaces, "
+          f"{latency * 1000:.1f} ms per PDU, {workers or snmp.max_workers} workers")
+    print(f"{'cycle':>6} {'routers':>8} {'wall s':>8} {'requests':>9} {'req/s':>9} {'peak MB':>8}")
+
+    failures = 0
+    for cycle in range(cycles + 2):
+        traced = cycle == cycles + 1  # Last cycle repeats a warm one under tracemalloc, which slows it down
+        if traced:
+            tracemalloc.start()
+        requests = fleet.requests()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):  # Per-router progress lines would drown the table
+            network_data, interface_status = snmp.fetch_router_data(workers=workers)
+        elapsed = time.perf_counter() - start
+        requests = fleet.requests() - requests
+        peak = "-"
+        if traced:
+            peak = f"{tracemalloc.get_traced_memory()[1] / 1e6:.1f}"
+            tracemalloc.stop()
+        label = "cold" if cycle == 0 else ("traced" if traced else str(cycle))
+        print(f"{label:>6} {len(network_data):>8} {elapsed:>8.2f} {requests:>9} {requests / elapsed:>9.0f} {peak:>8}")
+
+        if len(network_data) != len(fleet.agents):
+            print(f"[ERROR] Collected {len(network_data)} of {len(fleet.agents)} routers")
+            failures += 1
+        mismatches = verify_collection(network_data, interface_status, fleet)
+        if mismatches:
+            print(f"[ERROR] Collected data differs from the simulated agents for {', '.join(mismatches)}")
+            failures += 1
+    return 1 if failures else 0
+
+# Function to time one module import in a fresh interpreter, returning (best seconds, heavy modules loaded)
+def measure_import(module, repeat=3):
+    probe = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        f"import {module}\n"
+        "elapsed = time.perf_counter() - start\n"
+        "print(json.dumps([elapsed, sorted({name.split('.')[0] for name in sys.modules})]))\n"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # Directory containing the netman package
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [root, os.environ.get("PYTHONPATH")]))}
+    best, heavy = float("inf"), []
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, env=env)
+        if result.returncode != 0:
+            lines = result.stderr.strip().splitlines()
+            raise RuntimeError(lines[-1] if lines else "import failed")
+        elapsed, loaded = json.loads(result.stdout)
+        best = min(best, elapsed)
+        heavy = [name for name in heavy_modules if name in loaded]
+    return best, heavy
+
+# Benchmark guarding startup latency: every module must import fast and without unneeded heavy dependencies
+def bench_imports(max_ms, repeat):
+    failures = 0
+    print(f"{'module':<20} {'import ms':>10}  heavy dependencies")
+    for module, allowed in import_allowances.items():
+        try:
+            elapsed, heavy = measure_import(module, repeat)
+        except RuntimeError as e:
+            print(f"[ERROR] {module}: {e}")
+            failures += 1
+            continue
+        print(f"{module:<20} {elapsed * 1000:>10.1f}  {', '.join(heavy) or '-'}")
+        unexpected = [name for name in heavy if name not in allowed]
+        if unexpected:
+            print(f"[ERROR] {module} imports {', '.join(unexpected)} at load time")
+            failures += 1
+        if elapsed * 1000 > max_ms:
+            print(f"[ERROR] {module} took {elapsed * 1000:.1f} ms to import, budget is {max_ms:.0f} ms")
+            failures += 1
+    return 1 if failures else 0
+
+# Function to run the selected benchmark from the command line
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="NetMan performance benchmarks")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+    parsers_cmd = subparsers.add_parser("parsers", help="CLI output parser throughput")
+    parsers_cmd.add_argument("--lines", type=int, default=100000, help="rows in each synthetic output")
+    git_cmd = subparsers.add_parser("git", help="config backup commit/push latency against a local bare remote")
+    git_cmd.add_argument("--devices", type=int, default=500, help="device configs in the repository")
+    git_cmd.add_argument("--cycles", type=int, default=50, help="backup cycles to run")
+    git_cmd.add_argument("--changed", type=int, default=25, help="devices changed per cycle")
+    git_cmd.add_argument("--collectors", type=int, default=8, help="concurrent collectors for the coalescing test")
+    snmp_cmd = subparsers.add_parser("snmp", help="SNMP collection wall time, requests/s and memory against simulated agents")
+    snmp_cmd.add_argument("--devices", type=int, default=200, help="simulated routers")
+    snmp_cmd.add_argument("--interfaces", type=int, default=50, help="interfaces per router")
+    snmp_cmd.add_argument("--latency", type=float, default=0.002, help="seconds of round trip per PDU")
+    snmp_cmd.add_argument("--workers", type=int, default=None, help="routers polled at the same time")
+    snmp_cmd.add_argument("--cycles", type=int, default=3, help="collection cycles after the cold one")
+    snmp_cmd.add_argument("--fixture", default=None, help="lab router file the agents are built from (default: netman/lab-routers.json)")
+    imports_cmd = subparsers.add_parser("imports", help="import time and heavy dependencies of every module")
+    imports_cmd.add_argument("--max-ms", type=float, default=import_budget_ms, help="import budget per module")
+    imports_cmd.add_argument("--repeat", type=int, default=3, help="fresh interpreters per module, best is kept")
+    args = parser.parse_args(argv)
+
+    if args.benchmark == "parsers":
+        bench_parsers(args.lines)
+    elif args.benchmark == "git":
+        bench_git(args.devices, args.cycles, args.changed, args.collectors)
+    elif args.benchmark == "snmp":
+        return bench_snmp(args.devices, args.interfaces, args.latency, args.workers, args.cycles, args.fixture)
+    elif args.benchmark == "imports":
+        return bench_imports(args.max_ms, args.repeat)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+
+import importlib
+import sys
+from netman import metrics
+
+# Subcommand -> (module, entry point, help), modules are only imported when their subcommand runs
+commands = {
+    "snmp": ("netman.snmp", "main", "collect router addresses and interface statuses, then monitor CPU"),
+    "rates": ("netman.rates", "main", "compute per-interface bit rates from 64-bit counters"),
+    "pcap": ("netman.tcpdump", "main", "extract EUI-64 MAC addresses from ICMPv6 Echo Requests"),
+    "dhcp": ("netman.dhcp", "main", "configure the DHCP pools on R5 and wait for the clients"),
+    "push": ("netman.push", "main", "push a jobs file of config commands to many devices"),
+    "resolve": ("netman.resolver", "main", "resolve MAC addresses to IPv6 addresses from neighbor tables"),
+    "backup": ("netman.github", "main", "back up device configs to a Git remote"),
+    "simulate": ("netman.simulator", "main", "run an SNMP command against simulated agents instead of the routers"),
+    "bench": ("netman.benchmark", "main", "run the performance benchmarks")
+}
+
+# Options accepted before the subcommand -> help
+global_options = {
+    "--metrics-file": "write Prometheus metrics to this file (every 15s and at exit)",
+    "--metrics-port": "serve Prometheus metrics on this port at /metrics",
+    "--profile": "run the command under cProfile and save the stats to this file"
+}
+
+# Function to print the list of subcommands
+def print_usage():
+    print("Usage: netman [--metrics-file PATH] [--metrics-port PORT] [--profile PATH] <command> [options]\n\nCommands:")
+    for name, (_, _, description) in commands.items():
+        print(f"  {name:<10}{description}")
+    print("\nOptions:")
+    for name, description in global_options.items():
+        print(f"  {name:<16}{description}")
+
+# Function to split the leading global options off the arguments, returning (options, remaining arguments)
+def parse_global_options(argv):
+    options = {}
+    while argv and argv[0].split("=", 1)[0] in global_options:
+        name, _, value = argv[0].partition("=")
+        if not value:
+            if len(argv) < 2:
+                raise ValueError(f"{name} needs a value")
+            value, argv = argv[1], argv[1:]
+        options[name] = value
+        argv = argv[1:]
+    return options, argv
+
+# Function to dispatch to a subcommand, returning its exit status
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    try:
+        options, argv = parse_global_options(argv)
+        port = int(options["--metrics-port"]) if "--metrics-port" in options else None
+    except ValueError as e:
+        print(f"[ERROR] {e}")
+        return 2
+    if not argv or argv[0] in ("-h", "--help"):
+        print_usage()
+        return 0 if argv else 2
+    if argv[0] not in commands:
+        print(f"[ERROR] Unknown command: {argv[0]}")
+        print_usage()
+        return 2
+
+    module_name, entry_point, _ = commands[argv[0]]
+    if "--metrics-file" in options:
+        metrics.export_to_file(options["--metrics-file"])
+    if port is not None:
+        metrics.serve_metrics(port)
+    with metrics.profiled(options.get("--profile")):  # No-op unless --profile is given
+        module = importlib.import_module(module_name)  # Heavy dependencies load here, for this command only
+        status = getattr(module, entry_point)(argv[1:])
+    return status if isinstance(status, int) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
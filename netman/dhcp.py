@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+
+import sys
+import time
+from netman import metrics
+from netman.parsers import parse_dhcp_bindings
+from netman.push import push_configs
+from netman.resolver import NeighborResolver
+from netman.sshpool import default_pool
+
+# DHCP convergence wait settings
+dhcp_wait_deadline = 60  # Seconds to wait for all expected clients to bind
+dhcp_poll_initial = 0.5  # Seconds before the first re-check of the binding table
+dhcp_poll_max = 8  # Upper bound for the backoff between checks
+
+# Function to find which of the expected MACs have a lease in a "show ip dhcp binding" output
+def bound_macs(binding_output, expected_macs):
+    wanted = {mac.replace(".", "").replace(":", "").lower(): mac for mac in expected_macs}
+    leased = {binding.mac.replace(".", "") for binding in parse_dhcp_bindings(binding_output) if binding.mac}
+    return {wanted[digits] for digits in leased if digits in wanted}
+
+# Function to poll the binding table with exponential backoff until every expected MAC has a lease
+def wait_for_dhcp_bindings(conn, expected_macs, deadline=None, initial_delay=None, max_delay=None):
+    deadline = deadline or dhcp_wait_deadline
+    delay = initial_delay or dhcp_poll_initial
+    max_delay = max_delay or dhcp_poll_max
+    start_time = time.monotonic()
+    checks = 0
+
+    while True:
+        with metrics.timed("netmiko_command", device=getattr(conn, "host", None), command="show ip dhcp binding"):
+            binding_output = conn.send_command("show ip dhcp binding")
+        checks += 1
+        found = bound_macs(binding_output, expected_macs)
+        elapsed = time.monotonic() - start_time
+        if len(found) == len(set(expected_macs)):
+            metrics.observe("netman_operation_seconds", elapsed, operation="dhcp_convergence", device=getattr(conn, "host", None))
+            print(f"DHCP converged in {elapsed:.2f}s after {checks} check(s)")
+            return binding_output, found, elapsed
+
+        remaining = deadline - elapsed
+        if remaining <= 0:
+            metrics.record_failure("dhcp_convergence", timeout=True, device=getattr(conn, "host", None))
+            missing = sorted(set(expected_macs) - found)
+            print(f"[WARNING] DHCP did not converge within {deadline}s, still missing: {', '.join(missing)}")
+            return binding_output, found, None
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, max_delay)  # Back off while clients are still negotiating
+
+r4_details = {
+    'device_type': 'cisco_ios',
+    'host': '25.0.0.1',
+    'username': 'admin',
+    'password': 'admin'
+}
+
+#MAC address of R5 Fa0/0
+r5_mac = "ca05.4c8c.0000"
+
+r2_mac = "ca02.4c31.0000"
+r3_mac = "ca03.4c50.0000"
+
+# Define DHCP pool configurations:
+dhcp_commands = [
+    # Static DHCP binding for R2-F0/0
+    "ip dhcp pool R2_POOL",
+    " host 40.0.0.2 255.255.255.0",
+    " hardware-address " + r2_mac,
+    " exit",
+    # Static DHCP binding for R3-F0/0
+    "ip dhcp pool R3_POOL",
+    " host 40.0.0.3 255.255.255.0",
+    " hardware-address " + r3_mac,
+    " exit",
+    # Dynamic DHCP pool for R4-Fa0/0
+    "ip dhcp pool R4_POOL",
+    " network 40.0.0.0 255.255.255.0",
+    " default-router 40.0.0.1",
+    " exit"
+]
+
+# Function to configure the DHCP pools on R5 and wait for the clients to bind
+def main(argv=None):
+    # Resolve R5's IPv6 address from the cached neighbor tables, logging into R4 only on a cache miss
+    resolver = NeighborResolver([r4_details])
+    r5_ipv6 = resolver.lookup(r5_mac)
+
+    if not r5_ipv6:
+        print("ERROR: Could not determine R5's IPv6 address from R4.")
+        return 1
+
+    print(f"Found R5 IPv6 address: {r5_ipv6}")
+
+    # R5 connection using the IPv6 address
+    r5_details = {
+        'device_type': 'cisco_ios',
+        'host': r5_ipv6,
+        'username': 'admin',
+        'password': 'admin',
+    }
+
+    # Push the DHCP pools through the push engine (retries and timeouts included)
+    print(f"Configuring DHCP pools on R5 using IPv6 address {r5_ipv6}")
+    push_result = push_configs([(r5_details, dhcp_commands)])[r5_ipv6]
+    if not push_result["ok"]:
+        # The cached address may be stale, ask R4 again and retry once if R5 moved
+        resolver.invalidate(r5_mac)
+        new_ipv6 = resolver.lookup(r5_mac)
+        if new_ipv6 and new_ipv6 != r5_ipv6:
+            print(f"R5 moved to {new_ipv6}, retrying")
+            r5_ipv6 = r5_details['host'] = new_ipv6
+            push_result = push_configs([(r5_details, dhcp_commands)])[r5_ipv6]
+    if not push_result["ok"]:
+        print(f"Failed to configure R5: {push_result['error']}")
+        return 1
+    print("DHCP configuration output:", push_result["output"])
+
+    # Reuse the session the push engine left warm in the pool
+    try:
+        with default_pool.session(r5_details) as r5:
+            # Wait until the DHCP clients have leases, returning early as soon as they do
+            dhcp_binding_output, dhcp_bound, dhcp_convergence_time = wait_for_dhcp_bindings(r5, [r2_mac, r3_mac])
+        print("DHCP Binding Table:", dhcp_binding_output)
+        print(f"Bound clients: {', '.join(sorted(dhcp_bound)) or 'none'}")
+
+        # Extract the leased client addresses from the DHCP binding table
+        dhcp_ips = [binding.ip for binding in parse_dhcp_bindings(dhcp_binding_output)]
+        print("List of DHCPv4 Client IP Addresses:")
+        for ip in dhcp_ips:
+            print(ip)
+
+    except Exception as e:
+        print(f"Failed to connect to R5: {e}")
+        return 1
+    return 0 if dhcp_convergence_time is not None else 1  # Missing leases after the deadline is a failure
+
+if __name__ == "__main__":
+    sys.exit(main())
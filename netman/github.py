@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+
+import os
+import re
+import json
+import hashlib
+import time
+import getpass
+import argparse
+import threading
+from urllib.parse import urlsplit, urlunsplit
+from netman import metrics
+
+backup_dir = "configs"  # Directory inside the repository holding one file per device
+config_suffix = ".cfg"  # Extension of the device config files
+push_debounce = 5  # Seconds of quiet after the last push request before pushing
+push_max_delay = 30  # Longest a push request can wait while requests keep arriving
+push_retry_delay = 30  # Seconds before a failed coalesced push is tried again
+digest_index_name = "netman-config-digests.json"  # Local digest index, kept in the .git directory so it is never committed
+index_lock = threading.RLock()  # Serializes read-modify-write of the digest index between collectors and pushes
+
+# Lines that change on every "show running-config" without the configuration changing
+volatile_lines = re.compile(
+    r"^(?:Building configuration\.\.\."
+    r"|Current configuration : \d+ bytes"
+    r"|! Last configuration change at .*"
+    r"|! NVRAM config last updated at .*"
+    r"|! No configuration change since last restart"
+    r"|ntp clock-period \d+"
+    r"|! Time: .*)[ \t]*\r?\n?",
+    re.MULTILINE
+)
+
+# Function to initialize the repo if it doesn't exist
+def init_repo(repo_dir):
+    import git  # GitPython is only needed once a repository is opened
+    from git import Repo
+
+    # Check if the repository directory does not exist
+    if not os.path.exists(repo_dir):
+        os.makedirs(repo_dir)  # Create the repository directory if it doesn't exist
+
+    try:
+        repo = Repo(repo_dir)  # Attempt to create a Repo object for the given directory
+        if not repo.bare:  # If the repository is not bare (a bare repo has no working tree)
+            print(f"Repository already initialized at {repo_dir}")  # Inform the user that the repo is already initialized
+        else:
+            print("Initializing repository")  # If repo is bare, initialize it
+            repo = Repo.init(repo_dir)  # Initialize the repo as a bare repo (no working tree)
+    except git.exc.InvalidGitRepositoryError:  # Exception handling for invalid repository error
+        print("Initializing repository")  # Inform user that the repo is being initialized
+        repo = Repo.init(repo_dir)  # Initialize a new repo if the given path isn't a valid repo
+    return repo  # Return the initialized or existing repo object
+
+# Function to create an initial commit
+def create_initial_commit(repo):
+    # If no commits exist in the repository, we need to create one
+    if not repo.head.is_valid():  # Check if the repository has any commits
+        # Create a new empty file to commit if no files exist
+        with open(os.path.join(repo.working_tree_dir, 'README.md'), 'w') as f:  # Create a README file
+            f.write("# Initial Commit\n")  # Write initial content in the README file
+        repo.index.add(['README.md'])  # Add the README file to the git index (staging area)
+        repo.index.commit("Initial commit")  # Create the initial commit
+        print("Initial commit created.")  # Inform the user that the initial commit has been created
+
+# Function to commit changes to the repository
+def commit_changes(repo, commit_message, paths=None):
+    with metrics.timed("git_commit"):
+        if paths is None:
+            repo.git.add(A=True)  # Adds all modified files in the repo to the staging area
+        else:
+            repo.index.add(paths)  # Stage only the paths we already know changed, no working tree scan
+        commit = repo.index.commit(commit_message)  # Commit the staged changes with the provided commit message
+    print("Changes committed successfully.")  # Inform the user that changes were committed
+    return commit
+
+# Function to build the URL to push to, embedding credentials only for HTTP(S) remotes
+def remote_push_url(remote_url, username=None, token=None):
+    parts = urlsplit(remote_url)
+    if parts.scheme not in ("http", "https") or not (username and token):
+        return remote_url  # Local paths, file:// and SSH remotes are used as they are
+    host = parts.netloc.rsplit("@", 1)[-1]  # Drop any credentials already in the URL
+    return urlunsplit((parts.scheme, f"{username}:{token}@{host}", parts.path, parts.query, parts.fragment))
+
+# Function to push changes to the remote (GitHub, any other server, or a local bare repository)
+def push_changes(repo, branch='main', username=None, token=None, remote_url=None, remote_name='origin'):
+    start_time = time.monotonic()  # Push latency, reported below
+    remote = repo.remote(remote_name)  # Access the remote of the repository
+    if remote_url:
+        url = remote_push_url(remote_url, username, token)  # Using HTTPS with the username and personal access token for authentication
+        if url not in remote.urls:  # Only rewrite the remote config when the URL actually changed
+            remote.set_url(url)
+
+    # Check if the branch exists locally, if not, create it
+    if branch not in repo.heads:  # Check if the branch doesn't exist locally
+        print(f"Branch '{branch}' does not exist locally. Creating it now.")  # Inform the user that a new branch is being created
+        repo.git.checkout("-b", branch)  # Create and switch to the new branch
+
+    # Push the branch and set upstream if it's the first push
+    with metrics.timed("git_push", remote=remote_name):
+        repo.git.push("--set-upstream", remote_name, branch)  # Push the local branch to the remote repository and set the upstream
+    elapsed = time.monotonic() - start_time
+    print(f"Changes pushed to the '{branch}' branch of '{remote_name}' in {elapsed:.2f}s.")  # Inform the user that the changes were pushed
+    mark_pushed(repo, branch, remote_name)  # Devices count as backed up only once the remote has their commit
+    return elapsed
+
+# Function to count the local commits of a branch that its remote-tracking branch does not have yet
+def unpushed_commits(repo, branch='main', remote_name='origin'):
+    if not repo.head.is_valid():
+        return 0  # Nothing committed yet
+    local = branch if branch in repo.heads else "HEAD"  # push_changes creates the branch from HEAD
+    tracking = f"{remote_name}/{branch}"
+    if tracking not in [ref.name for ref in repo.refs]:
+        return int(repo.git.rev_list("--count", local))  # Never pushed: every commit is pending
+    return int(repo.git.rev_list("--count", f"{tracking}..{local}"))  # Local check, no network round trip
+
+# Coalesces push requests from many collectors into a single debounced push
+class PushCoalescer:
+    def __init__(self, repo, branch='main', username=None, token=None, remote_url=None, debounce=None, max_delay=None, retry_delay=None):
+        self.repo = repo
+        self.push_args = (branch, username, token, remote_url)
+        self.debounce = push_debounce if debounce is None else debounce
+        self.max_delay = push_max_delay if max_delay is None else max_delay
+        self.retry_delay = push_retry_delay if retry_delay is None else retry_delay
+        self.lock = threading.Lock()  # Guards the pending state below
+        self.push_lock = threading.Lock()  # Only one push runs at a time
+        self.timer = None
+        self.first_request = None  # When the oldest pending request arrived
+        self.requests = 0
+        self.pushes = 0
+        self.failures = 0
+
+    # Method called by collectors after they commit; the push happens once things go quiet
+    def request_push(self):
+        with self.lock:
+            self.requests += 1
+            now = time.monotonic()
+            if self.first_request is None:
+                self.first_request = now
+            if self.timer:
+                self.timer.cancel()  # Restart the quiet period
+            delay = min(self.debounce, max(0.0, self.first_request + self.max_delay - now))  # Never starve the push
+            self.timer = threading.Timer(delay, self.flush)
+            self.timer.daemon = True
+            self.timer.start()
+
+    # Method to push now if any request is pending; returns True if a push was made
+    def flush(self):
+        with self.lock:
+            if self.first_request is None:
+                return False  # Nothing pending
+            if self.timer:
+                self.timer.cancel()
+                self.timer = None
+            pending_since, self.first_request = self.first_request, None
+        with self.push_lock:
+            try:
+                push_changes(self.repo, *self.push_args)
+            except Exception as e:
+                # Runs in a Timer thread, so nobody would see the exception: count it and try again later
+                metrics.record_failure("git_push_coalesced", e, branch=self.push_args[0])
+                print(f"[ERROR] Coalesced push failed, retrying in {self.retry_delay}s: {e}")
+                self.failures += 1
+                self.retry(pending_since)
+                return False
+            self.pushes += 1
+        return True
+
+    # Method to keep a failed push pending and re-arm the timer, unless a newer request already did
+    def retry(self, pending_since):
+        with self.lock:
+            if self.first_request is None:
+                self.first_request = pending_since
+            if self.timer is None:
+                self.timer = threading.Timer(self.retry_delay, self.flush)
+                self.timer.daemon = True
+                self.timer.start()
+
+# Function to strip volatile lines (timestamps, ntp clock-period, ...) from a config
+def normalize_config(text):
+    return volatile_lines.sub("", text)
+
+# Function to compute the content address of a config
+def config_digest(text):
+    return hashlib.sha256(normalize_config(text).encode()).hexdigest()
+
+# Function to get the path of the local digest index of a repository
+def digest_index_path(repo):
+    return os.path.join(repo.git_dir, digest_index_name)
+
+# Function to load the device -> {digest, commit, time} index of the last backups
+def load_digest_index(repo):
+    try:
+        with open(digest_index_path(repo)) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}  # No backups yet (or a damaged index, which only costs one full rewrite)
+
+# Function to save the digest index atomically
+def save_digest_index(repo, index):
+    path = digest_index_path(repo)
+    with open(path + ".tmp", "w") as f:
+        json.dump(index, f, indent=4, sort_keys=True)
+    os.replace(path + ".tmp", path)
+
+# Function to flag the index entries whose commit reached the remote-tracking branch after a push
+def mark_pushed(repo, branch='main', remote_name='origin'):
+    with index_lock:
+        index = load_digest_index(repo)
+        pushed = f"{remote_name}/{branch}"
+        updated = False
+        for entry in index.values():
+            if entry.get("pushed", True) or not entry.get("commit"):
+                continue
+            if repo.is_ancestor(entry["commit"], pushed):  # Commits made while the push ran stay pending
+                entry["pushed"] = True
+                updated = True
+        if updated:
+            save_digest_index(repo, index)
+
+# Function to list the devices whose config changed, or whose backup has not been pushed yet (for other tools)
+def changed_since_last_backup(repo, configs, index=None):
+    index = load_digest_index(repo) if index is None else index
+    changed = []
+    for device, text in configs.items():
+        entry = index.get(device, {})
+        if entry.get("digest") != config_digest(text) or not entry.get("pushed", True):  # Entries from before push tracking count as pushed
+            changed.append(device)
+    return changed
+
+# Function to write the configs that changed and return (changed paths, their new digests)
+def write_configs(repo, configs, index=None):
+    index = load_digest_index(repo) if index is None else index
+    directory = os.path.join(repo.working_tree_dir, backup_dir)  # Backup directory inside the repo
+    os.makedirs(directory, exist_ok=True)  # Create it on the first backup
+    changed = []  # Repository-relative paths whose content changed
+    digests = {}  # Device -> new digest, recorded once the commit succeeds
+    for device, text in configs.items():
+        digest = config_digest(text)
+        if index.get(device, {}).get("digest") == digest:
+            continue  # Unchanged device: no filesystem write, no Git stage
+        rel_path = os.path.join(backup_dir, device + config_suffix)  # One file per device
+        full_path = os.path.join(repo.working_tree_dir, rel_path)
+        if device not in index and os.path.exists(full_path):
+            with open(full_path) as f:
+                if config_digest(f.read()) == digest:  # Backed up before the index existed
+                    index[device] = {"digest": digest, "commit": None, "time": None}
+                    continue
+        with open(full_path, "w") as f:
+            f.write(text)  # Write only devices whose config changed
+        changed.append(rel_path)
+        digests[device] = digest
+    return changed, digests
+
+# Function to run one backup cycle: write the batch, make at most one commit, push at most once
+def backup_cycle(repo, configs, branch='main', username=None, token=None, remote_url=None, push=True, pusher=None):
+    with index_lock:  # A push finishing meanwhile must not have its pushed flags overwritten
+        commit, changed = commit_batch(repo, configs)
+    if not changed:
+        pending = unpushed_commits(repo, branch)
+        if pending and (pusher or push):
+            # An earlier push failed after its commit succeeded, retry it now
+            print(f"No config changes in this cycle, pushing {pending} earlier commit(s).")
+            if pusher:
+                pusher.request_push()
+            else:
+                push_changes(repo, branch, username, token, remote_url)
+        else:
+            print("No config changes in this cycle, skipping commit and push.")  # Nothing to do
+        return None
+    print(f"Backed up {len(changed)} changed config(s): {', '.join(sorted(changed))}")
+    if pusher:
+        pusher.request_push()  # Coalesced with the pushes of other collectors
+    elif push:
+        push_changes(repo, branch, username, token, remote_url)  # Single push for the whole batch
+    return commit
+
+# Function to write and commit the changed configs of a batch, returning (commit or None, changed paths)
+def commit_batch(repo, configs):
+    index = load_digest_index(repo)  # Digests of the last backed-up configs
+    known = len(index)
+    changed, digests = write_configs(repo, configs, index)  # Paths we know changed, so Git does not have to look
+    if not changed:
+        if len(index) != known:
+            save_digest_index(repo, index)  # Keep entries adopted from files written before the index existed
+        return None, changed
+    message = f"Config backup: {len(changed)} device(s) changed at {time.strftime('%Y-%m-%d %H:%M:%S')}"
+    commit = commit_changes(repo, message, changed)  # One commit per collection cycle
+    for device, digest in digests.items():
+        index[device] = {"digest": digest, "commit": commit.hexsha, "time": time.time(), "pushed": False}
+    save_digest_index(repo, index)  # Only record digests that made it into a commit, pushed once the remote has it
+    return commit, changed
+
+# Function to load a batch of configs from a directory of <device>.cfg files written by a collector
+def load_configs(directory):
+    configs = {}
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(config_suffix):
+            with open(os.path.join(directory, name)) as f:
+                configs[name[:-len(config_suffix)]] = f.read()  # Device name -> config text
+    return configs
+
+# Function to back up configs from the command line
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Back up device configs to GitHub or any Git remote")
+    parser.add_argument("--configs", help="directory of <device>.cfg files to back up in one commit")
+    parser.add_argument("--repo-dir", default="/home/netman/GITREPO", help="local repository path")
+    parser.add_argument("--remote", default="https://github.com/AravindhGoutham/NetMAN.git",
+                        help="remote URL or path, e.g. a local bare repository for offline testing")
+    parser.add_argument("--branch", default="main", help="branch to push")
+    args = parser.parse_args(argv)
+
+    repo_dir = args.repo_dir  # Local repository path
+    remote_url = args.remote  # GitHub repo URL (or any other remote)
+    username = "AravindhGoutham"  #GitHub username
+    token = None
+    if urlsplit(remote_url).scheme in ("http", "https"):  # Only HTTPS remotes need the token
+        token = getpass.getpass("Enter your GitHub personal access token (hidden): ")
+    branch = args.branch
+
+    # Initialize the repository
+    repo = init_repo(repo_dir)  # Initialize or get the repository at the given path
+
+    # Check if remote exists, if not, add the remote repository
+    if not repo.remotes:  # Check if no remotes exist in the repository
+        print(f"Adding remote repository: {remote_url}")  # Inform the user that the remote is being added
+        repo.create_remote('origin', remote_url)  # Add the remote repository as a remote named 'origin'
+
+    # Create the initial commit if no commits exist
+    create_initial_commit(repo)  # Create the initial commit if the repository is empty
+
+    if args.configs:
+        # Back up a collector's batch: only changed devices are written, one commit, at most one push
+        backup_cycle(repo, load_configs(args.configs), branch, username, token, remote_url)
+    elif repo.is_dirty(untracked_files=True):  # Single scan of the working tree
+        # Commit everything that changed and push once
+        commit_changes(repo, "Initial commit or update")  # Commit all changes with a message
+        push_changes(repo, branch, username, token, remote_url)  # Push the committed changes to the remote
+    elif unpushed_commits(repo, branch):  # Committed earlier but the push failed
+        print("No new changes, pushing earlier commits.")
+        push_changes(repo, branch, username, token, remote_url)
+    else:
+        print("No changes detected to push.")  # Inform the user if there were no changes to push
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+
+import atexit
+import bisect
+import os
+import socket
+import threading
+import time
+from contextlib import contextmanager
+
+# Metrics settings
+latency_buckets = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)  # Histogram upper bounds in seconds
+export_interval = 15  # Seconds between two rewrites of the metrics file
+rate_window = 1.0  # Seconds of packets averaged by a packets-per-second gauge
+
+# Metric name -> (type, help), in the order they are exported
+catalog = {
+    "netman_operation_seconds": ("histogram", "Latency of SNMP, Netmiko, pcap and Git operations"),
+    "netman_operation_errors_total": ("counter", "Operations that failed, per device"),
+    "netman_operation_timeouts_total": ("counter", "Operations that timed out, per device"),
+    "netman_packets_total": ("counter", "Packets read from captures"),
+    "netman_packets_per_second": ("gauge", "Packets processed per second over the last scan or window")
+}
+
+# Registry shared by every collector in the process
+histograms = {}  # (name, labels) -> [bucket counts..., +Inf count, sum]
+counters = {}  # (name, labels) -> value
+gauges = {}  # (name, labels) -> value
+registry_lock = threading.Lock()  # Guards the three dictionaries above
+
+# Function to turn keyword labels into a hashable, ordered key
+def label_key(labels):
+    return tuple(sorted((name, str(value)) for name, value in labels.items() if value is not None))
+
+# Function to add one latency observation to a histogram
+def observe(name, seconds, **labels):
+    key = (name, label_key(labels))
+    slot = bisect.bisect_left(latency_buckets, seconds)  # First bucket whose bound is >= seconds
+    with registry_lock:
+        entry = histograms.get(key)
+        if entry is None:
+            entry = histograms[key] = [0] * (len(latency_buckets) + 1) + [0.0]
+        entry[slot] += 1  # Cumulated only when exported, so recording stays O(1)
+        entry[-1] += seconds
+
+# Function to add to a counter
+def increment(name, amount=1, **labels):
+    key = (name, label_key(labels))
+    with registry_lock:
+        counters[key] = counters.get(key, 0) + amount
+
+# Function to set a gauge to its current value
+def set_gauge(name, value, **labels):
+    with registry_lock:
+        gauges[(name, label_key(labels))] = value
+
+# Function to tell timeouts apart from other failures
+def is_timeout(error):
+    return isinstance(error, (TimeoutError, socket.timeout)) or "timeout" in type(error).__name__.lower()
+
+# Function to count a failed operation as an error or a timeout
+def record_failure(operation, error=None, timeout=None, **labels):
+    timeout = is_timeout(error) if timeout is None else timeout
+    name = "netman_operation_timeouts_total" if timeout else "netman_operation_errors_total"
+    increment(name, operation=operation, **labels)
+
+# Context manager timing one operation, failures are counted and re-raised
+@contextmanager
+def timed(operation, **labels):
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception as e:
+        record_failure(operation, e, **labels)
+        raise
+    finally:
+        observe("netman_operation_seconds", time.perf_counter() - start, operation=operation, **labels)
+
+# Packets-per-second gauge for continuous captures, updated once per window
+class RateGauge:
+    def __init__(self, window=None, **labels):
+        self.window = window or rate_window
+        self.labels = labels
+        self.count = 0  # Packets in the current window
+        self.started = time.monotonic()
+        self.lock = threading.Lock()  # Packets are counted by the capture, flushes may come from a sweeper thread
+
+    # Method to count packets and publish the rate when the window is over
+    def tick(self, packets=1):
+        with self.lock:
+            self.count += packets
+            if time.monotonic() - self.started >= self.window:
+                self.publish()
+
+    # Method to publish the window if it is over, or the partial window when final; quiet captures drop to 0 pps
+    def flush(self, final=False):
+        with self.lock:
+            if final or time.monotonic() - self.started >= self.window:
+                self.publish()
+
+    # Method to export the current window and start a new one (caller holds the lock)
+    def publish(self):
+        now = time.monotonic()
+        elapsed = now - self.started
+        set_gauge("netman_packets_per_second", self.count / elapsed if elapsed > 0 else 0.0, **self.labels)
+        if self.count:
+            increment("netman_packets_total", self.count, **self.labels)
+        self.count = 0
+        self.started = now
+
+# Function to escape a label value for the Prometheus text format
+def escape(value):
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+# Function to format a sample line
+def sample_line(name, labels, value):
+    if labels:
+        name += "{" + ",".join(f'{label}="{escape(text)}"' for label, text in labels) + "}"
+    return f"{name} {value!r}"
+
+# Function to render every metric in the Prometheus text exposition format
+def render():
+    with registry_lock:
+        snapshot = {key: list(entry) for key, entry in histograms.items()}
+        snapshot.update(counters)
+        snapshot.update(gauges)
+    lines = []
+    names = list(catalog) + sorted({name for name, _ in snapshot} - set(catalog))
+    for name in names:
+        keys = sorted(key for key in snapshot if key[0] == name)
+        if not keys:
+            continue
+        kind, description = catalog.get(name, ("untyped", name))
+        lines.append(f"# HELP {name} {description}")
+        lines.append(f"# TYPE {name} {kind}")
+        for key in keys:
+            labels, value = key[1], snapshot[key]
+            if kind != "histogram":
+                lines.append(sample_line(name, labels, value))
+                continue
+            cumulative = 0
+            for bound, count in zip(latency_buckets + ("+Inf",), value[:-1]):
+                cumulative += count
+                lines.append(sample_line(name + "_bucket", labels + (("le", str(bound)),), cumulative))
+            lines.append(sample_line(name + "_sum", labels, value[-1]))
+            lines.append(sample_line(name + "_count", labels, cumulative))
+    return "\n".join(lines) + "\n"
+
+# Function to write the metrics atomically, e.g. for the node_exporter textfile collector
+def write_metrics(path):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        f.write(render())
+    os.replace(tmp_path, path)
+
+# Function to rewrite the metrics file periodically and once more when the process exits
+def export_to_file(path, interval=None):
+    interval = interval or export_interval
+    stop_event = threading.Event()
+
+    # Function run by the background writer
+    def writer():
+        while not stop_event.wait(interval):
+            try:
+                write_metrics(path)
+            except OSError as e:
+                print(f"[WARNING] Could not write metrics to {path}: {e}")
+
+    threading.Thread(target=writer, daemon=True).start()
+    atexit.register(write_metrics, path)  # Short runs still leave their final numbers behind
+    return stop_event
+
+# Function to serve the metrics at http://address:port/metrics from a background thread
+def serve_metrics(port, address=""):
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # Scrapes every few seconds would flood the output
+
+    server = ThreadingHTTPServer((address, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"Serving metrics on http://{address or '0.0.0.0'}:{server.server_address[1]}/metrics")
+    return server
+
+# Context manager running a block under cProfile and saving the stats for pstats/snakeviz
+@contextmanager
+def profiled(path=None, top=20):
+    if not path:
+        yield None
+        return
+    import cProfile
+    import pstats
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
+        print(f"Profile saved to {path}, top {top} functions by cumulative time:")
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(top)
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+
+import re
+from collections import namedtuple
+
+# Typed records returned by the parsers
+Neighbor = namedtuple("Neighbor", ["ipv6", "age", "mac", "state", "interface"])
+DhcpBinding = namedtuple("DhcpBinding", ["ip", "client_id", "mac", "lease", "type", "state", "interface"])
+
+# One row of "show ipv6 neighbors", anchored to the whole line
+neighbor_line = re.compile(
+    r"^[ \t]*(?P<ipv6>[0-9A-Fa-f]*:[0-9A-Fa-f:.]*)"  # IPv6 address (must contain a colon)
+    r"[ \t]+(?P<age>\d+|-)"  # Age in minutes, "-" for static entries
+    r"[ \t]+(?P<mac>[0-9A-Fa-f]{4}\.[0-9A-Fa-f]{4}\.[0-9A-Fa-f]{4}|-)"  # Link-layer address, "-" while INCMP
+    r"[ \t]+(?P<state>[A-Z]+)"  # REACH, STALE, DELAY, PROBE, INCMP
+    r"[ \t]+(?P<interface>\S+)[ \t]*\r?$",
+    re.MULTILINE
+)
+
+# One row of "show ip dhcp binding", or a continuation line of a long client ID
+dhcp_binding_line = re.compile(
+    r"^(?:(?P<ip>\d{1,3}(?:\.\d{1,3}){3})"  # Rows start with the leased address in column 0
+    r"[ \t]+(?P<client_id>[0-9A-Fa-f.]+)"  # Client-ID or hardware address (may wrap)
+    r"[ \t]+(?P<lease>\S.*?)"  # Lease expiration, "Infinite" or a date with spaces
+    r"[ \t]+(?P<type>Automatic|Manual|Static|Dynamic|Unknown)"
+    r"(?:[ \t]+(?P<state>\S+)[ \t]+(?P<interface>\S+))?"  # Columns added by newer IOS releases
+    r"|[ \t]+(?P<more>[0-9A-Fa-f]{2,4}(?:\.[0-9A-Fa-f]{1,4})*\.?))"  # Wrapped rest of the client ID
+    r"[ \t]*\r?$",
+    re.MULTILINE
+)
+
+# Function to convert a Cisco client ID or hardware address to a dotted MAC, or None
+def client_id_to_mac(client_id):
+    digits = client_id.replace(".", "").lower()
+    if len(digits) == 14 and digits.startswith("01"):
+        digits = digits[2:]  # Client-ID type 01 (Ethernet) followed by the MAC
+    if len(digits) != 12:
+        return None  # Text client IDs such as "cisco-..." are not MACs
+    return f"{digits[0:4]}.{digits[4:8]}.{digits[8:12]}"
+
+# Function to parse "show ipv6 neighbors" into Neighbor records
+def parse_ipv6_neighbors(output):
+    neighbors = []
+    for ipv6, age, mac, state, interface in neighbor_line.findall(output):
+        neighbors.append(Neighbor(
+            ipv6,
+            None if age == "-" else int(age),
+            None if mac == "-" else mac.lower(),
+            state,
+            interface
+        ))
+    return neighbors
+
+# Function to parse "show ip dhcp binding" into DhcpBinding records
+def parse_dhcp_bindings(output):
+    rows = []  # [ip, client_id, lease, type, state, interface] per binding
+    for ip, client_id, lease, kind, state, interface, more in dhcp_binding_line.findall(output):
+        if ip:
+            rows.append([ip, client_id, lease, kind, state, interface])
+        elif rows:
+            rows[-1][1] += more  # Continuation of the previous row's client ID
+
+    bindings = []
+    for ip, client_id, lease, kind, state, interface in rows:
+        client_id = client_id.rstrip(".").lower()
+        bindings.append(DhcpBinding(ip, client_id, client_id_to_mac(client_id), lease, kind, state or None, interface or None))
+    return bindings
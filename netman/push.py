@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from netman import metrics
+from netman.sshpool import default_pool
+
+# Push engine settings
+max_workers = 20  # Maximum number of devices configured at the same time
+command_timeout = 60  # Seconds allowed for a command set to finish on the device
+max_retries = 2  # Extra attempts for a device after the first failure
+retry_delay = 2  # Seconds before the first retry, doubled after each failure
+
+# Function to push one device's command set, retrying failed attempts
+def push_config(device, commands, retries=None, timeout=None, pool=None):
+    pool = pool or default_pool
+    retries = max_retries if retries is None else retries
+    timeout = timeout or command_timeout
+    host = device["host"]
+    start_time = time.monotonic()
+    error = None
+
+    for attempt in range(1, retries + 2):
+        try:
+            with pool.session(device) as conn:  # Warm session, failed ones are dropped by the pool
+                with metrics.timed("netmiko_config", device=host):
+                    output = conn.send_config_set(commands, read_timeout=timeout)  # Push the whole set in one go
+            return {"host": host, "ok": True, "output": output, "error": None,
+                    "attempts": attempt, "elapsed": time.monotonic() - start_time}
+        except Exception as e:
+            error = str(e)
+            print(f"[WARNING] {host}: attempt {attempt} failed: {e}")
+            if attempt <= retries:
+                time.sleep(retry_delay * 2 ** (attempt - 1))  # Back off before trying again
+
+    print(f"[ERROR] {host}: giving up after {retries + 1} attempt(s)")
+    return {"host": host, "ok": False, "output": None, "error": error,
+            "attempts": retries + 1, "elapsed": time.monotonic() - start_time}
+
+# Function to push command sets to many devices in parallel and collect the results by host
+def push_configs(jobs, workers=None, retries=None, timeout=None, pool=None):
+    jobs = list(jobs)  # (device, commands) pairs
+    workers = workers or max_workers
+    results = {}
+    if not jobs:
+        return results
+
+    start_time = time.monotonic()
+    with ThreadPoolExecutor(max_workers=min(workers, len(jobs))) as executor:
+        futures = {executor.submit(push_config, device, commands, retries, timeout, pool): device["host"] for device, commands in jobs}
+        for future in as_completed(futures):
+            host = futures[future]
+            try:
+                results[host] = future.result()
+            except Exception as e:
+                results[host] = {"host": host, "ok": False, "output": None, "error": str(e), "attempts": 0, "elapsed": 0.0}
+            status = "OK" if results[host]["ok"] else "FAILED"
+            print(f"{host}: {status} in {results[host]['elapsed']:.1f}s")
+
+    failed = [host for host, result in results.items() if not result["ok"]]
+    print(f"Pushed to {len(results) - len(failed)}/{len(results)} devices in {time.monotonic() - start_time:.1f}s")
+    if failed:
+        print(f"Failed devices: {', '.join(sorted(failed))}")
+    return results
+
+# Function to load jobs from a JSON file: [{"device": {...}, "commands": [...]}, ...]
+def load_jobs(filename):
+    with open(filename) as f:
+        return [(job["device"], job["commands"]) for job in json.load(f)]
+
+# Function to push a jobs file from the command line, returning the exit status
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 1:
+        print("Usage: netman push <jobs.json>")
+        return 2
+    results = push_configs(load_jobs(argv[0]))
+    return 0 if all(result["ok"] for result in results.values()) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+
+import argparse
+import threading
+import time
+import numpy as np
+from netman import metrics
+from netman.snmp import TimeSeriesPoller, max_repetitions, normalize_oid, oid_if_hc_in_octets, oid_if_hc_out_octets, oid_sys_uptime
+
+# Interface rate engine settings
+rate_interval = 10  # Seconds between two counter polls of the same router
+rate_capacity = 360  # Rate samples kept per interface (one hour at the default interval)
+max_sample_gap = 5  # Intervals after which the previous sample is too old to compute a rate from
+counter_wrap_zone = 2 ** 63  # A 64-bit counter can only have wrapped if its last value was above this
+counter_columns = (oid_if_hc_in_octets, oid_if_hc_out_octets)  # Walked side by side, in this order
+walk_buffer_rows = 256  # Interfaces a router's walk buffers hold before they are grown
+end_of_walk_types = ("ENDOFMIBVIEW", "NOSUCHOBJECT", "NOSUCHINSTANCE")  # Varbind types that end a column
+
+# Reusable arrays one router's counter walk is written into, so polls do not build per-interface objects
+class CounterWalkBuffers:
+    def __init__(self, size=None):
+        size = size or walk_buffer_rows
+        self.if_indexes = np.zeros((len(counter_columns), size), np.int64)  # Column -> ifIndexes in walk order
+        self.octets = np.zeros((len(counter_columns), size), np.uint64)  # Column -> counter values in walk order
+        self.counts = [0] * len(counter_columns)  # Rows filled per column by the last walk
+        self.uptime = None  # sysUpTime read in the same PDU as the first rows
+
+    # Method to double the number of rows the buffers hold, keeping the rows already filled
+    def grow(self):
+        self.if_indexes = np.concatenate([self.if_indexes, np.zeros_like(self.if_indexes)], axis=1)
+        self.octets = np.concatenate([self.octets, np.zeros_like(self.octets)], axis=1)
+
+    # Method to return the (ifIndexes, in octets, out octets) present in both columns of the last walk
+    def table(self):
+        count_in, count_out = self.counts
+        in_indexes, out_indexes = self.if_indexes[0, :count_in], self.if_indexes[1, :count_out]
+        if count_in == count_out and np.array_equal(in_indexes, out_indexes):
+            return in_indexes, self.octets[0, :count_in], self.octets[1, :count_out]  # Usual case: views, no copies
+        common, in_rows, out_rows = np.intersect1d(in_indexes, out_indexes, assume_unique=True, return_indices=True)
+        return common, self.octets[0, in_rows], self.octets[1, out_rows]
+
+# Function to read sysUpTime and walk both counter columns with GETBULK, writing the rows straight into buffers
+def walk_counters(session, buffers, repetitions=None):
+    repetitions = repetitions or max_repetitions
+    prefixes = [oid + "." for oid in counter_columns]
+    active = list(range(len(counter_columns)))  # Columns still inside their subtree
+    last = list(counter_columns)  # OID each column continues from
+    buffers.counts = [0] * len(counter_columns)
+    buffers.uptime = None
+    uptime_oid = oid_sys_uptime.rsplit(".", 1)[0]  # GETBULK non-repeaters act like GETNEXT, so ask for the parent
+
+    while active:
+        oids = [last[column] for column in active]
+        non_repeaters = 0
+        if buffers.uptime is None:
+            oids.insert(0, uptime_oid)
+            non_repeaters = 1  # sysUpTime rides along in the first PDU instead of costing its own round trip
+        varbinds = session.get_bulk(oids, non_repeaters=non_repeaters, max_repetitions=repetitions)
+        if non_repeaters:
+            if not varbinds or normalize_oid(varbinds[0]) != oid_sys_uptime:
+                raise RuntimeError("agent did not return sysUpTime")
+            buffers.uptime = float(varbinds[0].value)  # Timeticks
+            varbinds = varbinds[1:]
+
+        done = set()
+        for position, entry in enumerate(varbinds):
+            column = active[position % len(active)]  # Repetitions are interleaved column by column
+            if column in done:
+                continue
+            oid = normalize_oid(entry)
+            if getattr(entry, "snmp_type", None) in end_of_walk_types or not oid.startswith(prefixes[column]) or oid == last[column]:
+                done.add(column)  # Left the subtree (or the agent stopped making progress)
+                continue
+            row = buffers.counts[column]
+            if row == buffers.if_indexes.shape[1]:
+                buffers.grow()
+            buffers.if_indexes[column, row] = int(oid[len(prefixes[column]):])
+            buffers.octets[column, row] = int(entry.value)
+            buffers.counts[column] = row + 1
+            last[column] = oid
+        if not varbinds:
+            break
+        active = [column for column in active if column not in done]
+    return buffers
+
+# Columnar store of per-interface counter state and bit rates, one row per (router, ifIndex)
+class InterfaceRateStore:
+    def __init__(self, capacity=None, interval=None):
+        self.capacity = capacity or rate_capacity
+        self.interval = interval or rate_interval
+        self.rows = 0  # Rows in use
+        self.keys = []  # Row -> (router, ifIndex)
+        self.index = {}  # Router -> (sorted ifIndex array, matching row array)
+        self.lock = threading.Lock()
+        self.allocate(64)
+
+    # Method to (re)allocate the arrays so that they hold at least size rows
+    def allocate(self, size):
+        # Function to extend an array with size - len(array) rows of fill
+        def grow(array, fill):
+            return np.concatenate([array, np.full((size - len(array),) + array.shape[1:], fill, array.dtype)])
+
+        if getattr(self, "last_in", None) is None:
+            self.last_in = np.zeros(size, np.uint64)  # Last counter values
+            self.last_out = np.zeros(size, np.uint64)
+            self.last_time = np.full(size, np.nan)  # Wall-clock time of the last sample, NaN = no baseline
+            self.last_uptime = np.zeros(size, np.float64)  # sysUpTime of the last sample
+            self.count = np.zeros(size, np.int64)  # Rate samples written per row
+            self.times = np.full((size, self.capacity), np.nan)  # Ring of sample times per row
+            self.in_bps = np.full((size, self.capacity), np.nan, np.float32)  # Ring of inbound bit rates
+            self.out_bps = np.full((size, self.capacity), np.nan, np.float32)  # Ring of outbound bit rates
+        else:
+            self.last_in = grow(self.last_in, 0)
+            self.last_out = grow(self.last_out, 0)
+            self.last_time = grow(self.last_time, np.nan)
+            self.last_uptime = grow(self.last_uptime, 0)
+            self.count = grow(self.count, 0)
+            self.times = grow(self.times, np.nan)
+            self.in_bps = grow(self.in_bps, np.nan)
+            self.out_bps = grow(self.out_bps, np.nan)
+
+    # Method to map a router's ifIndexes to rows, adding rows for interfaces seen for the first time (caller holds lock)
+    def rows_for(self, router, if_indexes):
+        known, rows = self.index.get(router, (np.empty(0, np.int64), np.empty(0, np.int64)))
+        positions = np.searchsorted(known, if_indexes)
+        found = positions < len(known)
+        found[found] = known[positions[found]] == if_indexes[found]
+        if found.all():
+            return rows[positions]
+
+        new = np.unique(if_indexes[~found])  # Rare path: new interfaces
+        if self.rows + len(new) > len(self.last_in):
+            self.allocate(max(2 * len(self.last_in), self.rows + len(new)))
+        new_rows = np.arange(self.rows, self.rows + len(new))
+        self.rows += len(new)
+        self.keys.extend((router, int(if_index)) for if_index in new)
+        known = np.concatenate([known, new])
+        rows = np.concatenate([rows, new_rows])
+        order = np.argsort(known, kind="stable")
+        self.index[router] = (known[order], rows[order])
+        return self.rows_for(router, if_indexes)
+
+    # Method to find the row of one interface without adding it, None if it was never polled (caller holds lock)
+    def row_of(self, router, if_index):
+        known, rows = self.index.get(router, (np.empty(0, np.int64), np.empty(0, np.int64)))
+        position = int(np.searchsorted(known, if_index))
+        if position < len(known) and known[position] == if_index:
+            return int(rows[position])
+        return None
+
+    # Method to add one poll of a router and compute the rates of all its interfaces at once
+    def update(self, router, if_indexes, in_octets, out_octets, uptime, timestamp):
+        if_indexes = np.asarray(if_indexes, np.int64)
+        in_octets = np.asarray(in_octets, np.uint64)
+        out_octets = np.asarray(out_octets, np.uint64)
+        with self.lock:
+            rows = self.rows_for(router, if_indexes)
+            elapsed = timestamp - self.last_time[rows]  # NaN for first samples
+            usable = (elapsed > 0) & (elapsed <= max_sample_gap * self.interval)  # Missed too many samples otherwise
+            usable &= uptime >= self.last_uptime[rows]  # sysUpTime went backwards: rebooted, counters reset
+
+            with np.errstate(over="ignore"):
+                delta_in = in_octets - self.last_in[rows]  # uint64 arithmetic wraps modulo 2**64
+                delta_out = out_octets - self.last_out[rows]
+            # A lower value is a wrap only if the old value was near the top, otherwise the counter was reset
+            usable &= (in_octets >= self.last_in[rows]) | (self.last_in[rows] >= counter_wrap_zone)
+            usable &= (out_octets >= self.last_out[rows]) | (self.last_out[rows] >= counter_wrap_zone)
+
+            rate_rows = rows[usable]
+            slots = self.count[rate_rows] % self.capacity
+            self.times[rate_rows, slots] = timestamp
+            self.in_bps[rate_rows, slots] = delta_in[usable] * 8.0 / elapsed[usable]
+            self.out_bps[rate_rows, slots] = delta_out[usable] * 8.0 / elapsed[usable]
+            self.count[rate_rows] += 1
+
+            # Every polled interface becomes the new baseline
+            self.last_in[rows] = in_octets
+            self.last_out[rows] = out_octets
+            self.last_time[rows] = timestamp
+            self.last_uptime[rows] = uptime
+        return int(usable.sum())
+
+    # Method to return (times, inbound bps, outbound bps) of one interface in chronological order
+    def rates(self, router, if_index):
+        with self.lock:
+            row = self.row_of(router, if_index)  # Reads must not allocate rows for unknown interfaces
+            if row is None:
+                return np.empty(0), np.empty(0, np.float32), np.empty(0, np.float32)
+            count = int(self.count[row])
+            order = np.arange(count - min(count, self.capacity), count) % self.capacity
+            return self.times[row, order].copy(), self.in_bps[row, order].copy(), self.out_bps[row, order].copy()
+
+    # Method to return the latest rate of every interface as (keys, inbound bps, outbound bps)
+    def latest(self):
+        with self.lock:
+            rows = np.nonzero(self.count[:self.rows])[0]
+            slots = (self.count[rows] - 1) % self.capacity
+            return [self.keys[row] for row in rows], self.in_bps[rows, slots].copy(), self.out_bps[rows, slots].copy()
+
+# Poller that walks the 64-bit interface counters of every router and feeds an InterfaceRateStore
+class InterfaceRatePoller(TimeSeriesPoller):
+    def __init__(self, devices=None, interval=None, jitter=None, capacity=None, workers=None):
+        interval = interval or rate_interval
+        super().__init__({}, devices, interval, jitter, workers=workers)
+        self.store = InterfaceRateStore(capacity, interval)
+        self.walk_buffers = {router: CounterWalkBuffers() for router in self.devices}  # A router is never polled twice at once
+
+    # Method to walk sysUpTime and both counter columns in one GETBULK walk and hand them to the store
+    def sample(self, router, session):
+        buffers = self.walk_buffers[router]
+        with metrics.timed("snmp_bulk_walk", device=self.devices[router], columns="uptime,in,out"):
+            walk_counters(session, buffers)
+        timestamp = time.time()
+        if_indexes, in_octets, out_octets = buffers.table()
+        if not len(if_indexes):
+            return
+        self.store.update(router, if_indexes, in_octets, out_octets, buffers.uptime, timestamp)
+
+# Function to print the latest rate of every interface
+def print_rates(store):
+    keys, in_bps, out_bps = store.latest()
+    for (router, if_index), rate_in, rate_out in zip(keys, in_bps, out_bps):
+        print(f"{router} ifIndex {if_index}: in {rate_in / 1e6:.2f} Mbit/s, out {rate_out / 1e6:.2f} Mbit/s")
+
+# Function to poll interface counters for a while and report the resulting rates
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compute per-interface bit rates from 64-bit SNMP counters")
+    parser.add_argument("--duration", type=float, default=60, help="Seconds to poll before reporting")
+    parser.add_argument("--interval", type=float, default=rate_interval, help="Seconds between two polls of a router")
+    args = parser.parse_args(argv)
+
+    poller = InterfaceRatePoller(interval=args.interval)
+    poller.run(duration=args.duration)
+    print_rates(poller.store)
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from netman import metrics
+from netman.parsers import parse_ipv6_neighbors
+from netman.sshpool import default_pool
+
+# Resolver settings
+neighbor_cache_file = "neighbor-cache.json"  # Cache kept between runs
+neighbor_cache_ttl = 900  # Seconds a learned neighbor is trusted without asking the routers again
+max_workers = 10  # Routers queried at the same time during a refresh
+
+# Function to normalize a MAC address to 12 lowercase hex digits
+def normalize_mac(mac):
+    return mac.replace(".", "").replace(":", "").replace("-", "").lower()
+
+# Function to check for a link-local address, which cannot be used without an interface scope
+def is_link_local(ipv6):
+    return ipv6.lower().startswith("fe80:")
+
+# Function to extract (ipv6, mac) pairs from "show ipv6 neighbors", skipping incomplete entries
+def parse_neighbors(output):
+    return [(neighbor.ipv6, neighbor.mac) for neighbor in parse_ipv6_neighbors(output) if neighbor.mac]
+
+# TTL cache of IPv6 neighbor tables from many routers, indexed by MAC
+class NeighborResolver:
+    def __init__(self, devices, cache_file=None, ttl=None, pool=None):
+        self.devices = list(devices)  # Netmiko device dicts of the routers to ask
+        self.pool = pool or default_pool  # Warm SSH sessions shared with the other scripts
+        self.cache_file = neighbor_cache_file if cache_file is None else cache_file
+        self.ttl = ttl or neighbor_cache_ttl
+        self.entries = {}  # mac -> {"ipv6", "router", "learned"}
+        self.lock = threading.Lock()
+        self.load()
+
+    # Method to load the cache written by a previous run
+    def load(self):
+        if not self.cache_file or not os.path.exists(self.cache_file):
+            return
+        try:
+            with open(self.cache_file) as f:
+                self.entries = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"[WARNING] Ignoring unreadable neighbor cache {self.cache_file}: {e}")
+
+    # Method to write the cache for the next run
+    def save(self):
+        if not self.cache_file:
+            return
+        with self.lock:
+            data = json.dumps(self.entries, indent=4)
+        tmp_path = self.cache_file + ".tmp"
+        with open(tmp_path, "w") as f:
+            f.write(data)
+        os.replace(tmp_path, self.cache_file)
+
+    # Method to collect the neighbor table of one router
+    def collect(self, device):
+        try:
+            with self.pool.session(device) as conn:
+                with metrics.timed("netmiko_command", device=device["host"], command="show ipv6 neighbors"):
+                    output = conn.send_command("show ipv6 neighbors")
+            return parse_neighbors(output)
+        except Exception as e:
+            print(f"[WARNING] Could not read neighbors from {device['host']}: {e}")
+            return []
+
+    # Method to re-read the neighbor tables of every router and rebuild the index
+    def refresh(self):
+        print(f"Refreshing IPv6 neighbor cache from {len(self.devices)} router(s)")
+        now = time.time()
+        with ThreadPoolExecutor(max_workers=min(max_workers, max(len(self.devices), 1))) as pool:
+            tables = list(pool.map(self.collect, self.devices))
+        fresh = {}
+        for device, neighbors in zip(self.devices, tables):
+            for ipv6, mac in neighbors:
+                key = normalize_mac(mac)
+                # Keep the first address seen, but prefer a routable one over link-local
+                if key not in fresh or (is_link_local(fresh[key]["ipv6"]) and not is_link_local(ipv6)):
+                    fresh[key] = {"ipv6": ipv6, "router": device["host"], "learned": now}
+        with self.lock:
+            self.entries.update(fresh)
+        self.save()
+
+    # Method to return the cached entry for a MAC if it is still within the TTL
+    def cached(self, mac):
+        with self.lock:
+            entry = self.entries.get(normalize_mac(mac))
+        if entry and time.time() - entry["learned"] < self.ttl:
+            return entry
+        return None
+
+    # Method to find the IPv6 address of a MAC, asking the routers only on a miss
+    def lookup(self, mac):
+        entry = self.cached(mac)
+        if entry is None:
+            self.refresh()
+            entry = self.cached(mac)
+        return entry["ipv6"] if entry else None
+
+    # Method to forget a MAC whose address did not work (e.g. a failed connection)
+    def invalidate(self, mac):
+        with self.lock:
+            removed = self.entries.pop(normalize_mac(mac), None)
+        if removed:
+            self.save()
+
+# Function to resolve MACs from the command line, returning the exit status
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) < 2:
+        print("Usage: netman resolve <router-host>[,<router-host>...] <mac> [<mac>...]")
+        return 2
+    devices = [{"device_type": "cisco_ios", "host": host, "username": "admin", "password": "admin"}
+               for host in argv[0].split(",")]
+    resolver = NeighborResolver(devices)
+    for mac in argv[1:]:
+        print(f"{mac} -> {resolver.lookup(mac) or 'not found'}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+
+import argparse
+import bisect
+import ipaddress
+import json
+import os
+import random
+import threading
+import time
+from netman import snmp
+
+# Simulator settings
+fixture_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "lab-routers.json")  # Lab routers with their real ifIndex tables
+default_latency = 0.002  # Seconds of simulated round trip per SNMP PDU
+sim_address_base = int(ipaddress.IPv4Address("10.0.0.1"))  # Management address of the first synthetic router
+sim_v4_base = int(ipaddress.IPv4Address("172.16.0.0"))  # Interface addresses of synthetic interfaces
+counter_rate_max = 125000000  # Highest simulated interface load in bytes per second (1 Gbit/s)
+
+# MIB columns served by the agents, the table index follows the column OID
+col_ipv4 = snmp.oid_ipv4
+col_ipv4_ifindex = snmp.oid_ipv4_ifindex
+col_ipv6_ifindex = "1.3.6.1.2.1.4.34.1.3"  # ipAddressIfIndex, indexed by type.length.address
+col_ifstatus = snmp.oid_ifstatus
+col_ifname = snmp.oid_ifname
+col_if_hc_in_octets = snmp.oid_if_hc_in_octets
+col_if_hc_out_octets = snmp.oid_if_hc_out_octets
+
+# Variable returned by a simulated session, with the attributes the collector reads from easysnmp
+class SimulatedVariable:
+    __slots__ = ("oid", "oid_index", "value", "snmp_type")
+
+    def __init__(self, oid, oid_index, value, snmp_type="OCTETSTR"):
+        self.oid = oid
+        self.oid_index = oid_index
+        self.value = value
+        self.snmp_type = snmp_type
+
+# Function to turn a dotted OID into a tuple that sorts in SNMP lexicographic order
+def oid_key(oid):
+    return tuple(int(part) for part in oid.split("."))
+
+# Function to build the endOfMibView varbind an agent returns past its last object
+def end_of_mib(oid):
+    return SimulatedVariable("." + oid, "", "ENDOFMIBVIEW", "ENDOFMIBVIEW")
+
+# Simulated SNMPv3 agent serving one router's tables
+class SimulatedAgent:
+    def __init__(self, name, host, interfaces, latency=None, seed=0):
+        self.name = name
+        self.host = host
+        self.latency = default_latency if latency is None else latency
+        self.engine_id = "".join(chr(b) for b in b"\x80\x00\x00\x09\x03" + ipaddress.IPv4Address(host).packed)
+        self.booted = time.monotonic()
+        self.requests = 0  # PDUs answered, every PDU costs one simulated round trip
+        self.lock = threading.Lock()
+        self.columns = {}  # Column OID -> sorted list of (index, value or callable)
+        self.walks = {}  # Walked prefix -> [(column OID, index, value)], built on first use
+        self.ordered = None  # (sorted OID keys, matching rows) of every object, built on first GETBULK
+        self.cpu = random.Random(seed)  # Deterministic CPU utilization per agent
+        self.interfaces = interfaces  # Ground truth the collected data is checked against
+        self.load(interfaces, seed)
+
+    # Method to fill the interface, address and counter tables from a list of interfaces
+    def load(self, interfaces, seed):
+        rows = {}
+        rates = random.Random(seed)
+        for interface in interfaces:
+            if_index = interface["if_index"]
+            if interface.get("name"):
+                rows.setdefault(col_ifname, []).append((str(if_index), interface["name"]))
+            if interface.get("status"):
+                rows.setdefault(col_ifstatus, []).append((str(if_index), "1" if interface["status"] == "Up" else "2"))
+            if interface.get("v4"):
+                rows.setdefault(col_ipv4, []).append((interface["v4"], interface["v4"]))
+                rows.setdefault(col_ipv4_ifindex, []).append((interface["v4"], str(if_index)))
+            for address in interface.get("v6", []):
+                octets = ".".join(str(b) for b in ipaddress.IPv6Address(address).packed)
+                rows.setdefault(col_ipv6_ifindex, []).append((f"2.16.{octets}", str(if_index)))
+            rates_in, rates_out = rates.randrange(counter_rate_max), rates.randrange(counter_rate_max)
+            rows.setdefault(col_if_hc_in_octets, []).append((str(if_index), self.counter(rates_in)))
+            rows.setdefault(col_if_hc_out_octets, []).append((str(if_index), self.counter(rates_out)))
+        for column, entries in rows.items():
+            self.columns[column] = sorted(entries, key=lambda entry: tuple(int(part) for part in entry[0].split(".")))
+
+    # Method to build a 64-bit octet counter growing at a fixed rate since the agent booted
+    def counter(self, rate):
+        return lambda: str(int((time.monotonic() - self.booted) * rate) % 2 ** 64)
+
+    # Method to return the rows under an OID prefix in lexicographic order
+    def rows_under(self, prefix):
+        if prefix not in self.walks:
+            rows = []
+            for column in sorted(self.columns, key=lambda oid: tuple(int(part) for part in oid.split("."))):
+                for index, value in self.columns[column]:
+                    if f"{column}.{index}".startswith(prefix + "."):
+                        rows.append((column, index, value))
+            self.walks[prefix] = rows
+        return self.walks[prefix]
+
+    # Method to return up to count objects that follow an OID in lexicographic order, scalars included
+    def rows_after(self, oid, count):
+        if self.ordered is None:
+            rows = [(column, index, value) for column, entries in self.columns.items() for index, value in entries]
+            for scalar in (snmp.oid_sys_uptime, snmp.oid_cpu_util, snmp.oid_engine_id):
+                rows.append((scalar.rsplit(".", 1)[0], "0", lambda scalar=scalar: self.get_scalar(scalar).value))
+            rows.sort(key=lambda row: oid_key(f"{row[0]}.{row[1]}"))
+            self.ordered = ([oid_key(f"{column}.{index}") for column, index, _ in rows], rows)
+        keys, rows = self.ordered
+        start = bisect.bisect_right(keys, oid_key(oid))
+        return rows[start:start + count]
+
+    # Method to answer a scalar GET
+    def get_scalar(self, oid):
+        if oid == snmp.oid_sys_uptime:
+            return SimulatedVariable("." + oid, "", str(int((time.monotonic() - self.booted) * 100)), "TICKS")
+        if oid == snmp.oid_cpu_util:
+            return SimulatedVariable("." + oid, "", str(self.cpu.randint(5, 40)), "GAUGE")
+        if oid == snmp.oid_engine_id:
+            return SimulatedVariable("." + oid, "", self.engine_id)
+        return SimulatedVariable("." + oid, "", "NOSUCHOBJECT", "NOSUCHOBJECT")
+
+    # Method to account for one PDU round trip
+    def round_trip(self, count=1):
+        with self.lock:
+            self.requests += count
+        if self.latency:
+            time.sleep(self.latency * count)
+
+# Session-compatible stand-in for easysnmp.Session, talking to a SimulatedAgent
+class SimulatedSession:
+    def __init__(self, agent, engine_id="", timeout=None, retries=0):
+        self.agent = agent
+        self.hostname = agent.host  # easysnmp sessions expose their target the same way
+        self.timeout = timeout  # Seconds per request like easysnmp, None waits for as long as the agent takes
+        self.retries = retries
+        if not engine_id:
+            self.round_trip()  # SNMPv3 engine discovery costs an extra round trip
+
+    # Method to account for count PDUs, giving up like easysnmp when the agent answers slower than the timeout
+    def round_trip(self, count=1):
+        if self.timeout is not None and self.agent.latency > self.timeout:
+            time.sleep(self.timeout * (self.retries + 1))
+            raise TimeoutError(f"timed out while connecting to remote host {self.hostname}")
+        self.agent.round_trip(count)
+
+    # Method to GET one OID or a list of OIDs in a single PDU
+    def get(self, oids):
+        self.round_trip()
+        if isinstance(oids, (list, tuple)):
+            return [self.agent.get_scalar(oid.lstrip(".")) for oid in oids]
+        return self.agent.get_scalar(oids.lstrip("."))
+
+    # Method to walk several OIDs with GETBULK, max_repetitions rows of each per PDU
+    def bulkwalk(self, oids, non_repeaters=0, max_repetitions=10):
+        walked = [self.agent.rows_under(prefix.lstrip(".")) for prefix in ([oids] if isinstance(oids, str) else oids)]
+        longest = max((len(rows) for rows in walked), default=0)
+        self.round_trip(longest // max_repetitions + 1)  # Columns share PDUs until the longest one ends
+        return [variable for rows in walked for variable in self.variables(rows)]
+
+    # Method to answer one GETBULK PDU: a GETNEXT per non-repeater, then max_repetitions rows per repeater, interleaved
+    def get_bulk(self, oids, non_repeaters=0, max_repetitions=10):
+        self.round_trip()
+        oids = [oid.lstrip(".") for oid in ([oids] if isinstance(oids, str) else oids)]
+        results = []
+        for oid in oids[:non_repeaters]:
+            results.extend(self.variables(self.agent.rows_after(oid, 1)) or [end_of_mib(oid)])
+        repeaters = [self.variables(self.agent.rows_after(oid, max_repetitions)) for oid in oids[non_repeaters:]]
+        for repetition in range(max_repetitions if repeaters else 0):
+            if all(repetition >= len(rows) for rows in repeaters):
+                break
+            for oid, rows in zip(oids[non_repeaters:], repeaters):
+                results.append(rows[repetition] if repetition < len(rows) else end_of_mib(oid))
+        return results
+
+    # Method to turn table rows into variables, evaluating counters at the time of the request
+    def variables(self, rows):
+        return [SimulatedVariable("." + column, index, value() if callable(value) else value) for column, index, value in rows]
+
+# Fleet of simulated agents addressed by host, used as the SNMP session factory
+class SimulatedFleet:
+    def __init__(self, agents):
+        self.agents = {agent.host: agent for agent in agents}
+        self.routers = {agent.name: agent.host for agent in agents}  # Same shape as snmp.routers
+
+    # Method to open a session like easysnmp.Session(hostname=..., ...)
+    def session(self, hostname, security_engine_id="", timeout=None, retries=0, **options):
+        agent = self.agents.get(hostname)
+        if agent is None:
+            raise ConnectionError(f"timed out waiting for {hostname}")  # What an unreachable agent looks like
+        return SimulatedSession(agent, security_engine_id, timeout, retries)
+
+    # Method to return the number of PDUs answered by all agents
+    def requests(self):
+        return sum(agent.requests for agent in self.agents.values())
+
+    # Method to install the fleet as the collector's session factory and inventory
+    def install(self):
+        snmp.session_factory = self.session
+        snmp.routers = dict(self.routers)
+        with snmp.pool_lock:
+            snmp.session_pool.clear()  # Sessions of a previous fleet must not be reused
+            snmp.engine_ids.clear()
+
+# Function to read the lab routers (management host and interface table with ifIndexes) from a fixture file
+def load_fixture(path=None):
+    with open(path or fixture_file) as f:
+        return json.load(f)
+
+# Function to add synthetic interfaces until a router has the requested number
+def synthetic_interfaces(device, interfaces, count):
+    used = {interface["if_index"] for interface in interfaces}
+    if_index = 0
+    k = 0
+    while len(interfaces) < count:
+        if_index += 1
+        if if_index in used:
+            continue
+        interfaces.append({
+            "if_index": if_index,
+            "name": f"Te{k // 48}/{k % 48}",  # Recorded routers only use Fa/Gi/Vo/Nu names
+            "status": "Down" if k % 7 == 6 else "Up",
+            "v4": str(ipaddress.IPv4Address(sim_v4_base + (device * count + k) % 2 ** 20)),
+            "v6": [f"2001:db8:{device:x}:{k:x}::1"]
+        })
+        k += 1
+    return interfaces
+
+# Function to build a fleet from the fixture, scaled to the given number of routers and interfaces
+def build_fleet(devices=None, interfaces=0, latency=None, fixture=None):
+    lab = load_fixture(fixture)
+    devices = devices or len(lab)
+    names = list(lab)
+    agents = []
+    for device in range(devices):
+        template = names[device % len(names)]
+        if device < len(names):
+            name, host = template, lab[template]["host"]  # Lab routers keep their name and address
+        else:
+            name = f"SIM{device + 1}"
+            host = str(ipaddress.IPv4Address(sim_address_base + device))
+        rows = synthetic_interfaces(device, [dict(interface) for interface in lab[template]["interfaces"]], interfaces)
+        agents.append(SimulatedAgent(name, host, rows, latency, seed=device))
+    return SimulatedFleet(agents)
+
+# Function to run a netman command against a simulated fleet instead of the live routers
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a netman SNMP command against simulated SNMPv3 agents")
+    parser.add_argument("--devices", type=int, default=0, help="simulated routers (default: the lab routers)")
+    parser.add_argument("--interfaces", type=int, default=0, help="interfaces per router, padded with synthetic ones")
+    parser.add_argument("--latency", type=float, default=default_latency, help="seconds of round trip per PDU")
+    parser.add_argument("--fixture", default=fixture_file, help="lab router file the agents are built from")
+    parser.add_argument("command", nargs=argparse.REMAINDER, help="netman command to run, e.g. snmp --no-cpu")
+    args = parser.parse_args(argv)
+
+    fleet = build_fleet(args.devices, args.interfaces, args.latency, args.fixture)
+    fleet.install()
+    print(f"Simulating {len(fleet.agents)} router(s) with {args.latency * 1000:.1f} ms round trips")
+
+    from netman.cli import main as cli_main
+    return cli_main(args.command or ["snmp", "--no-cpu"])
@@ -0,0 +1,604 @@
+#!/usr/bin/env python3
+
+import argparse
+import hashlib
+import heapq
+import ipaddress
+import json
+import os
+import random
+import time
+import threading
+from array import array
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from netman import metrics
+
+routers = {
+    "R1": "7.0.0.1",
+    "R2": "40.0.0.6",
+    "R3": "40.0.0.4",
+    "R4": "25.0.0.1",
+    "R5": "40.0.0.1"
+}
+
+snmp_version = 3
+
+# SNMPv3 Credentials - Define SNMPv3 credentials
+snmp_user = "aravindh"
+auth_protocol = "SHA"
+auth_password = "aravindh"
+priv_protocol = "AES128"
+priv_password = "aravindh"
+
+# SNMP OIDs
+oid_ipv4 = "1.3.6.1.2.1.4.20.1.1"  # OID for IPv4 addresses
+oid_ipv4_ifindex = "1.3.6.1.2.1.4.20.1.2"  # OID for the ifIndex of each IPv4 address (ipAdEntIfIndex)
+oid_ipv6 = "1.3.6.1.2.1.4.34.1.3.2.16"  # OID for IPv6 addresses, value is the ifIndex (ipAddressIfIndex)
+oid_ifstatus = "1.3.6.1.2.1.2.2.1.8"  # OID for interface status (up/down)
+oid_ifname = "1.3.6.1.2.1.31.1.1.1.1"  # OID for interface names
+oid_cpu_util = "1.3.6.1.4.1.9.2.1.58.0"  # OID for CPU utilization
+oid_engine_id = "1.3.6.1.6.3.10.2.1.1.0"  # OID for the agent's snmpEngineID
+oid_if_hc_in_octets = "1.3.6.1.2.1.31.1.1.1.6"  # OID for 64-bit inbound octet counters (ifHCInOctets)
+oid_if_hc_out_octets = "1.3.6.1.2.1.31.1.1.1.10"  # OID for 64-bit outbound octet counters (ifHCOutOctets)
+oid_sys_uptime = "1.3.6.1.2.1.1.3.0"  # OID for sysUpTime, goes backwards when the router reboots
+
+# Collection engine settings
+max_workers = 32  # Maximum number of routers polled at the same time
+snmp_timeout = 2  # Seconds to wait for an SNMP response before retrying
+snmp_retries = 1  # Number of retries for each SNMP request
+device_timeout = 30  # Seconds a router may take once its collection started before the cycle stops waiting for it
+max_repetitions = 25  # Rows requested per column in each GETBULK PDU
+session_idle_timeout = 300  # Seconds an unused pooled SNMP session is kept open
+
+# Inventory snapshot settings
+snapshot_dir = "snapshots"  # One JSON file per router, rewritten only when it changes
+snapshot_index = "index.json"  # Router -> SHA-256 digest of its last saved section
+changes_log = "changes.jsonl"  # Append-only log of per-router diffs
+export_file = "Router-info.json"  # Single-file dump of the whole inventory, written only with --export
+
+# Time-series poller settings
+poll_interval = 5  # Seconds between two polls of the same router
+poll_jitter = 1.0  # Maximum random offset (seconds) spreading routers across the interval
+ring_capacity = 720  # Samples kept per series (one hour at the default interval)
+
+# SNMP session pool - reuses sessions across collection cycles
+session_pool = {}  # (host, credentials) -> list of idle (session, last_used) pairs
+engine_ids = {}  # host -> snmpEngineID (hex) learned on first contact
+pool_lock = threading.Lock()  # Guards session_pool and engine_ids
+session_factory = None  # Replaces easysnmp.Session when set, e.g. by the offline agent simulator
+
+# Columns fetched together in one bulk walk, keyed by the name used in the results
+collection_columns = {
+    "ipv4": oid_ipv4,
+    "ipv4_ifindex": oid_ipv4_ifindex,
+    "ipv6": oid_ipv6,
+    "status": oid_ifstatus,
+    "name": oid_ifname
+}
+
+# Function to create an SNMP session for communication with the router
+def create_snmp_session(target, engine_id=""):
+    if session_factory is not None:
+        Session = session_factory
+    else:
+        from easysnmp import Session  # Imported on first use, the C bindings are slow to load
+    try:
+        session = Session(
+            hostname=target,
+            version=3,
+            security_level="authPriv",
+            security_username=snmp_user,
+            auth_protocol=auth_protocol,
+            auth_password=auth_password,
+            privacy_protocol=priv_protocol,
+            privacy_password=priv_password,
+            timeout=min(snmp_timeout, device_timeout / (snmp_retries + 1)),  # An unanswered request never outlasts the router's deadline
+            retries=snmp_retries,
+            use_numeric=True,  # Return numeric OIDs so table indexes can be matched by prefix
+            security_engine_id=engine_id  # Skips engine discovery when the ID is already known
+        )
+        return session  # Return the session object if successful
+    except Exception as e:
+        metrics.record_failure("snmp_session", e, device=target)
+        print(f"[ERROR] Failed to create SNMP session for {target}: {e}")  # Error handling
+        return None
+
+# Function to build the pool key for a host and the configured credentials
+def session_key(target):
+    return (target, snmp_user, auth_protocol, auth_password, priv_protocol, priv_password)
+
+# Function to close pooled sessions that have been idle for too long (caller holds pool_lock)
+def evict_idle_sessions(now=None):
+    now = now if now is not None else time.monotonic()
+    for key in list(session_pool):
+        session_pool[key] = [(s, used) for s, used in session_pool[key] if now - used < session_idle_timeout]
+        if not session_pool[key]:
+            del session_pool[key]  # Drop hosts with no idle sessions left
+
+# Function to learn and cache a host's snmpEngineID from a working session
+def remember_engine_id(target, session):
+    try:
+        value = session.get(oid_engine_id).value  # Octet string, one character per byte
+        engine_id = "".join(f"{ord(c):02x}" for c in value)
+    except Exception as e:
+        print(f"[WARNING] Could not read snmpEngineID from {target}: {e}")
+        return
+    if engine_id:
+        with pool_lock:
+            engine_ids[target] = engine_id
+
+# Function to take an SNMP session for a host from the pool, creating one if needed
+def acquire_snmp_session(target):
+    key = session_key(target)
+    with pool_lock:
+        evict_idle_sessions()
+        if session_pool.get(key):
+            return session_pool[key].pop()[0]  # Reuse the most recently returned session
+        engine_id = engine_ids.get(target, "")
+
+    session = create_snmp_session(target, engine_id)  # No idle session, open a new one
+    if session and not engine_id:
+        remember_engine_id(target, session)
+    return session
+
+# Function to hand a session back to the pool, or drop it if it failed
+def release_snmp_session(target, session, failed=False):
+    if session is None:
+        return
+    with pool_lock:
+        if failed:
+            engine_ids.pop(target, None)  # The agent may have been rebooted or replaced
+            return
+        session_pool.setdefault(session_key(target), []).append((session, time.monotonic()))
+
+# Function to turn an easysnmp variable into a plain numeric OID string
+def normalize_oid(entry):
+    oid = entry.oid.lstrip(".")  # Numeric OIDs come back with a leading dot
+    if oid.startswith("iso"):
+        oid = "1" + oid[3:]  # Translate the "iso" prefix back to its number
+    if entry.oid_index:
+        oid = f"{oid}.{entry.oid_index}"  # Re-attach the table index split off by net-snmp
+    return oid
+
+# Function to fetch several table columns with GETBULK in the same PDUs
+def snmp_bulk_walk(session, columns, repetitions=None):
+    results = {name: {} for name in columns}  # Column name -> {row index: value}
+    prefixes = [(name, oid + ".") for name, oid in columns.items()]
+    try:
+        with metrics.timed("snmp_bulk_walk", device=getattr(session, "hostname", None), columns=",".join(columns)):  # Column names keep the label short
+            entries = session.bulkwalk(list(columns.values()), max_repetitions=repetitions or max_repetitions)
+    except Exception as e:
+        print(f"[ERROR] SNMP bulk walk failed for OIDs {', '.join(columns.values())}: {e}")
+        return None
+
+    for entry in entries:
+        oid = normalize_oid(entry)
+        for name, prefix in prefixes:
+            if oid.startswith(prefix):
+                results[name][oid[len(prefix):]] = entry.value  # Store the value under its row index
+                break
+    return results
+
+# Function to merge columns that share an index into one row-indexed table
+def build_table(columns, names):
+    table = {}  # Row index -> {column name: value}
+    for name in names:
+        for index, value in columns.get(name, {}).items():
+            table.setdefault(index, {})[name] = value
+    return table
+
+# Function to parse an ifIndex value, returning None for anything that is not a positive integer
+def parse_if_index(value):
+    try:
+        if_index = int(value)
+    except (TypeError, ValueError):
+        return None
+    return if_index if if_index > 0 else None
+
+# Function to build the integer-keyed ifIndex -> {name, status} table of a router once
+def build_interface_index(columns):
+    interfaces = {}
+    for index, row in build_table(columns, ("name", "status")).items():
+        if_index = parse_if_index(index)
+        if if_index is not None:
+            row.setdefault("name", f"Interface-{if_index}")  # Fall back when ifName is missing
+            interfaces[if_index] = row
+    return interfaces
+
+# Function to turn a 16-octet OID suffix into an IPv6 address, or None if it is malformed
+def parse_ipv6_index(oid_suffix):
+    try:
+        octets = bytes(int(part) for part in oid_suffix.split("."))
+    except ValueError:
+        return None  # Octets outside 0-255 or non-numeric parts
+    if len(octets) != 16:
+        return None
+    return ipaddress.IPv6Address(octets).exploded  # Fully expanded, as stored in Router-info.json
+
+# Function to collect addresses and interface statuses from a single router, claim() returns False once the cycle gave up on it
+def collect_router(router, ip, claim=None):
+    print(f"Fetching SNMP data from {router} ({ip})")
+    start_time = time.monotonic()  # Start of this router's collection
+
+    session = acquire_snmp_session(ip)  # Reuse a pooled SNMP session for the router
+    if not session:
+        return None
+
+    columns = snmp_bulk_walk(session, collection_columns)  # All columns in one GETBULK walk
+    release_snmp_session(ip, session, failed=columns is None)  # Failed sessions are not reused
+    if columns is None:
+        return None
+
+    interfaces = build_interface_index(columns)  # ifIndex -> {name, status}, parsed once
+    addresses = {}  # Addresses of this router, keyed by interface name
+    statuses = {}  # Interface status of this router, keyed by interface name
+
+    # Function to look up an interface name from its ifIndex
+    def interface_name_for(if_index):
+        row = interfaces.get(if_index)
+        return row["name"] if row else f"Interface-{if_index}"
+
+    # Process IPv4 addresses, joined to interfaces through ipAdEntIfIndex
+    ipv4_ifindex = columns["ipv4_ifindex"]
+    for index, addr in columns["ipv4"].items():
+        if_index = parse_if_index(ipv4_ifindex.get(index))
+        if if_index is None:
+            print(f"[WARNING] {router}: no ifIndex for IPv4 address {addr}, skipping")
+            continue
+        addresses.setdefault(interface_name_for(if_index), {})["v4"] = addr  # Store IPv4 address
+
+    # Process IPv6 addresses, the ipAddressIfIndex value is the interface (multiple addresses per interface)
+    for index, value in columns["ipv6"].items():
+        ipv6_addr = parse_ipv6_index(index)  # Address is encoded in the row index
+        if_index = parse_if_index(value)
+        if ipv6_addr is None or if_index is None:
+            print(f"[WARNING] {router}: malformed IPv6 address row {index}, skipping")
+            continue
+        addresses.setdefault(interface_name_for(if_index), {}).setdefault("v6", []).append(ipv6_addr)  # Store IPv6 address
+
+    # Process interface status
+    for row in interfaces.values():
+        if "status" in row:
+            statuses[row["name"]] = "Up" if row["status"] == "1" else "Down"  # Store status as "Up" or "Down"
+
+    if claim is not None and not claim():
+        return None  # Already counted as a timeout, a late finish is neither a success nor worth a line
+    elapsed = time.monotonic() - start_time
+    metrics.observe("netman_operation_seconds", elapsed, operation="snmp_collect", device=ip)
+    print(f"Collected {router} ({ip}) in {elapsed:.2f}s")
+    return addresses, statuses
+
+# Function to fetch data from all routers concurrently
+def fetch_router_data(devices=None, workers=None):
+    devices = devices if devices is not None else routers  # Default to the configured routers
+    workers = workers or max_workers  # Default to the configured concurrency limit
+    network_data = {}  # Dictionary to store network data
+    interface_status = {}  # Dictionary to store interface status (Up/Down)
+    results = {}  # Per-router results, filled in as routers finish
+
+    started = {}  # Router -> when a worker picked it up, its deadline is device_timeout later
+    outcome = {}  # Router -> "collected" or "abandoned", whichever was settled first
+    outcome_lock = threading.Lock()
+
+    # Function settling a router's outcome once, returning whether this outcome is the one that stuck
+    def settle(router, result):
+        with outcome_lock:
+            return outcome.setdefault(router, result) == result
+
+    # Function run by the workers, recording when each router's collection really starts
+    def collect_with_start(router, ip):
+        started[router] = time.monotonic()
+        return collect_router(router, ip, claim=lambda: settle(router, "collected"))
+
+    start_time = time.monotonic()
+    pool = ThreadPoolExecutor(max_workers=min(workers, max(len(devices), 1)))
+    futures = {pool.submit(collect_with_start, router, ip): router for router, ip in devices.items()}  # Poll every router in parallel
+    pending = set(futures)
+    while pending:
+        running = [started[futures[future]] for future in pending if futures[future] in started]
+        timeout = max(0, min(running) + device_timeout - time.monotonic()) if running else device_timeout
+        done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+        for future in done:
+            router = futures[future]
+            try:
+                results[router] = future.result()
+            except Exception as e:
+                print(f"[ERROR] Collection failed for {router}: {e}")  # A failing router must not stop the others
+
+        # Stop waiting for routers past their deadline, the rest of the cycle goes on without them
+        now = time.monotonic()
+        for future in [future for future in pending if now - started.get(futures[future], now) >= device_timeout]:
+            router = futures[future]
+            if not settle(router, "abandoned"):
+                continue  # Finished right at the deadline, the next wait picks up its result
+            pending.discard(future)
+            metrics.record_failure("snmp_collect", timeout=True, device=devices[router])
+            print(f"[ERROR] Collection from {router} ({devices[router]}) exceeded {device_timeout}s, skipping")
+    pool.shutdown(wait=False)  # A stuck walk keeps its worker until the SNMP timeout ends it, but no longer blocks the cycle
+
+    # Keep the output in the same order as the router inventory
+    for router in devices:
+        if results.get(router):
+            network_data[router] = {"addresses": results[router][0]}
+            interface_status[router] = results[router][1]
+
+    print(f"Collected {len(network_data)}/{len(devices)} routers in {time.monotonic() - start_time:.2f}s")
+    return network_data, interface_status  # Return the collected network data and interface statuses
+
+# Function to save collected network data and interface statuses to a JSON file
+def save_data_to_json(router_info, interface_status, filename=None):
+    filename = filename or export_file  #output file name
+    with open(filename, "w") as f:
+        json.dump({"network": router_info, "interface_status": interface_status}, f, indent=4)  # Write to file in JSON format
+    print(f"Data saved to {filename}")
+
+# Function to compute a stable digest of one router's section
+def section_digest(section):
+    encoded = json.dumps(section, sort_keys=True, separators=(",", ":")).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+# Function to write a JSON file atomically so readers never see a half-written file
+def write_json_atomic(path, data):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, indent=4)
+    os.replace(tmp_path, path)
+
+# Function to flatten a router's addresses into a set of (interface, family, address)
+def address_set(addresses):
+    flat = set()
+    for interface, families in addresses.items():
+        if "v4" in families:
+            flat.add((interface, "v4", families["v4"]))
+        for addr in families.get("v6", []):
+            flat.add((interface, "v6", addr))
+    return flat
+
+# Function to describe what changed between two saved sections of a router
+def diff_sections(router, old, new):
+    old_addresses = address_set(old.get("addresses", {}))
+    new_addresses = address_set(new.get("addresses", {}))
+    old_status = old.get("interface_status", {})
+    new_status = new.get("interface_status", {})
+    return {
+        "router": router,
+        "added_addresses": [{"interface": i, "family": f, "address": a} for i, f, a in sorted(new_addresses - old_addresses)],
+        "removed_addresses": [{"interface": i, "family": f, "address": a} for i, f, a in sorted(old_addresses - new_addresses)],
+        "status_changes": [
+            {"interface": name, "from": old_status.get(name), "to": status}
+            for name, status in sorted(new_status.items()) if old_status.get(name) != status
+        ] + [{"interface": name, "from": status, "to": None} for name, status in sorted(old_status.items()) if name not in new_status]
+    }
+
+# Function to save only the routers whose data changed and return the diffs
+def save_snapshot(router_info, interface_status, directory=None):
+    directory = directory or snapshot_dir
+    os.makedirs(directory, exist_ok=True)
+    index_path = os.path.join(directory, snapshot_index)
+    try:
+        with open(index_path) as f:
+            digests = json.load(f)  # Router -> digest of the saved section
+    except (FileNotFoundError, json.JSONDecodeError):
+        digests = {}
+
+    changes = []  # Diffs of the routers that changed in this run
+    written = 0  # Routers whose file was rewritten
+    baselined = 0  # Routers saved for the first time
+    for router, data in router_info.items():
+        section = {"addresses": data.get("addresses", {}), "interface_status": interface_status.get(router, {})}
+        digest = section_digest(section)
+        if digests.get(router) == digest:
+            continue  # Unchanged routers cost neither a read nor a write
+
+        path = os.path.join(directory, f"{router}.json")
+        try:
+            with open(path) as f:
+                previous = json.load(f)  # Only changed routers are read back
+        except (FileNotFoundError, json.JSONDecodeError):
+            previous = {}
+        write_json_atomic(path, section)
+        digests[router] = digest
+        written += 1
+        if not previous:
+            baselined += 1
+            continue  # First snapshot is the baseline, not a change of every interface
+
+        diff = diff_sections(router, previous, section)
+        if diff["added_addresses"] or diff["removed_addresses"] or diff["status_changes"]:
+            changes.append(diff)
+
+    # Routers that failed to answer keep their last snapshot, they are not reported as removed
+    if changes:
+        timestamp = time.strftime("%Y-%m-%dT%H:%M:%S%z")
+        with open(os.path.join(directory, changes_log), "a") as f:
+            for diff in changes:
+                f.write(json.dumps({"time": timestamp, **diff}) + "\n")
+    if written:
+        write_json_atomic(index_path, digests)
+
+    print(f"Snapshot saved to {directory}: {written} router file(s) written, {baselined} new, {len(changes)} router(s) changed")
+    return changes
+
+# Function to print a diff in a form that is quick to read on call
+def print_changes(changes):
+    for diff in changes:
+        for entry in diff["added_addresses"]:
+            print(f"[CHANGE] {diff['router']} {entry['interface']}: +{entry['family']} {entry['address']}")
+        for entry in diff["removed_addresses"]:
+            print(f"[CHANGE] {diff['router']} {entry['interface']}: -{entry['family']} {entry['address']}")
+        for entry in diff["status_changes"]:
+            print(f"[CHANGE] {diff['router']} {entry['interface']}: {entry['from'] or 'new'} -> {entry['to'] or 'gone'}")
+
+# Fixed-size ring buffer of (timestamp, value) samples backed by flat arrays
+class RingBuffer:
+    def __init__(self, capacity=None):
+        self.capacity = capacity or ring_capacity
+        self.times = array("d", bytes(8 * self.capacity))  # Preallocated, never grows
+        self.values = array("d", bytes(8 * self.capacity))
+        self.count = 0  # Total number of samples ever written
+        self.lock = threading.Lock()  # Readers may run while the poller writes
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    # Method to store a sample, overwriting the oldest one when full
+    def append(self, timestamp, value):
+        with self.lock:
+            slot = self.count % self.capacity
+            self.times[slot] = timestamp
+            self.values[slot] = value
+            self.count += 1
+
+    # Method to copy out the stored samples in chronological order
+    def snapshot(self):
+        with self.lock:
+            if self.count <= self.capacity:
+                return self.times[:self.count], self.values[:self.count]
+            slot = self.count % self.capacity  # Oldest sample sits right after the newest
+            return self.times[slot:] + self.times[:slot], self.values[slot:] + self.values[:slot]
+
+# Poller that samples a set of OIDs on every router at fixed, drift-free intervals
+class TimeSeriesPoller:
+    def __init__(self, oids, devices=None, interval=None, jitter=None, capacity=None, workers=None, on_sample=None):
+        self.oids = dict(oids)  # Series name -> scalar OID
+        self.devices = dict(devices if devices is not None else routers)
+        self.interval = interval or poll_interval
+        self.jitter = poll_jitter if jitter is None else jitter
+        self.workers = workers or max_workers
+        self.on_sample = on_sample  # Optional callback(router, name, timestamp, value)
+        self.buffers = {(router, name): RingBuffer(capacity) for router in self.devices for name in self.oids}
+        self.stop_event = threading.Event()
+        self.in_flight = set()  # Routers with a poll still running
+        self.lock = threading.Lock()
+        self.thread = None
+
+    # Method to return the samples of one series while polling continues
+    def series(self, router, name):
+        return self.buffers[(router, name)].snapshot()
+
+    # Method to fetch and store one sample of a router (overridden by specialised pollers)
+    def sample(self, router, session):
+        names = list(self.oids)
+        with metrics.timed("snmp_get", device=self.devices[router]):
+            results = session.get([self.oids[name] for name in names])  # Every OID of the router in one GET
+        timestamp = time.time()
+        for name, entry in zip(names, results):
+            try:
+                value = float(entry.value)
+            except (TypeError, ValueError):
+                continue  # NOSUCHOBJECT and friends are not numeric
+            self.buffers[(router, name)].append(timestamp, value)
+            if self.on_sample:
+                self.on_sample(router, name, timestamp, value)
+
+    # Method to poll one router with a pooled session
+    def poll_device(self, router):
+        ip = self.devices[router]
+        session = acquire_snmp_session(ip)
+        try:
+            if not session:
+                return
+            try:
+                self.sample(router, session)
+            except Exception as e:
+                print(f"[WARNING] Failed to poll {router} ({ip}): {e}")
+                release_snmp_session(ip, session, failed=True)
+                return
+            release_snmp_session(ip, session)
+        finally:
+            with self.lock:
+                self.in_flight.discard(router)
+
+    # Method to run the schedule until stopped or until duration seconds have passed
+    def run(self, duration=None):
+        start = time.monotonic()
+        end = start + duration if duration else None
+        # Each router keeps its own phase, so polls are start + offset + k * interval with no drift
+        schedule = [(start + random.uniform(0, self.jitter), router) for router in self.devices]
+        heapq.heapify(schedule)
+
+        with ThreadPoolExecutor(max_workers=min(self.workers, max(len(self.devices), 1))) as pool:
+            while schedule and not self.stop_event.is_set():
+                due, router = heapq.heappop(schedule)
+                if end is not None and due >= end:
+                    break
+                if self.stop_event.wait(max(0, due - time.monotonic())):
+                    break
+
+                with self.lock:
+                    busy = router in self.in_flight
+                    if not busy:
+                        self.in_flight.add(router)
+                if busy:
+                    print(f"[WARNING] Previous poll of {router} still running, skipping this interval")
+                else:
+                    pool.submit(self.poll_device, router)
+
+                next_due = due + self.interval
+                now = time.monotonic()
+                if next_due < now:  # Skip intervals we already missed instead of bursting
+                    next_due += ((now - next_due) // self.interval + 1) * self.interval
+                heapq.heappush(schedule, (next_due, router))
+
+    # Method to run the poller in a background thread
+    def start(self, duration=None):
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self.run, args=(duration,), daemon=True)
+        self.thread.start()
+        return self.thread
+
+    # Method to stop a background poller and wait for it to finish
+    def stop(self):
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join()
+
+# Function to monitor and plot CPU utilization
+def monitor_cpu_util():
+    import matplotlib.pyplot as plt  # Only the CPU monitor plots, so keep it out of the import path
+
+    print("Monitoring CPU Utilization for 2 minutes...")  # Start monitoring message
+
+    poller = TimeSeriesPoller(
+        {"cpu": oid_cpu_util},
+        {"R1": routers["R1"]},
+        interval=5,  # Sample every 5 seconds
+        jitter=0,
+        on_sample=lambda router, name, timestamp, value: print(f"CPU Usage: {int(value)}%")  # Print the current CPU usage
+    )
+    start_time = time.time()  # Record the start time
+    poller.run(duration=120)  # Monitor for 2 minutes
+
+    times, cpu_data = poller.series("R1", "cpu")  # CPU samples collected by the poller
+    timestamps = [t - start_time for t in times]  # Seconds since monitoring started
+
+    # Plot and save the graph of CPU utilization
+    plt.figure(figsize=(10, 5))  # Create a figure with specified size
+    plt.plot(timestamps, cpu_data, marker='o', linestyle='-', color='b', label="CPU Usage")  # Plot the data
+    plt.xlabel("Time (seconds)")  # Label for X-axis
+    plt.ylabel("CPU Utilization (%)")  # Label for Y-axis
+    plt.title("CPU Utilization of R1")  # Title for the plot
+    plt.legend()  # Show legend for the plot
+    plt.grid()  # Add grid to the plot
+
+    filename = "cpu_utilization.jpg"  # Define output file name
+    plt.savefig(filename)  # Save the plot as an image
+    print(f"CPU utilization graph saved as {filename}")  # Confirmation message
+
+# Function to collect the inventory once, then optionally monitor CPU utilization
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Collect router addresses and interface statuses over SNMPv3")
+    parser.add_argument("--no-cpu", action="store_true", help="Skip the 2 minute CPU utilization monitor")
+    parser.add_argument("--export", nargs="?", const=export_file, metavar="PATH", help=f"Also dump the whole inventory to one JSON file (default: {export_file})")
+    args = parser.parse_args(argv)
+
+    network_data, interface_status = fetch_router_data()  # Fetch the network data and interface statuses
+    changes = save_snapshot(network_data, interface_status)  # Save only the routers that changed
+    if args.export:
+        save_data_to_json(network_data, interface_status, args.export)  # Former Router-info.json output, for scripts that read it
+    print_changes(changes)  # Report added/removed addresses and interface flips
+    if not args.no_cpu:
+        monitor_cpu_util()  # Monitor and plot CPU utilization
+
+if __name__ == "__main__":
+    main()
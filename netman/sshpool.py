@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+
+import atexit
+import threading
+import time
+from contextlib import contextmanager
+from netman import metrics
+
+# Connection pool settings
+connect_timeout = 15  # Seconds allowed for the TCP/SSH connection to come up
+idle_timeout = 300  # Seconds an unused connection is kept open
+
+# Function to open a privileged session to a device
+def connect_device(device):
+    from netmiko import ConnectHandler  # Pulls in paramiko and every vendor driver, so only load it to connect
+    with metrics.timed("ssh_connect", device=device["host"]):
+        conn = ConnectHandler(**{"conn_timeout": connect_timeout, **device})  # Device settings win over the defaults
+        conn.enable()
+    return conn
+
+# Function to build the pool key of a device
+def device_key(device):
+    return (device["host"], device.get("port", 22), device.get("username"), device.get("device_type"))
+
+# Pool of warm, privileged Netmiko sessions, one per device
+class ConnectionPool:
+    def __init__(self, idle_timeout_seconds=None, connect=None):
+        self.idle_timeout = idle_timeout_seconds or idle_timeout
+        self.connect = connect or connect_device  # Factory, replaceable for tests
+        self.entries = {}  # device key -> {"conn", "lock", "last_used"}
+        self.lock = threading.Lock()  # Guards self.entries only, never held while talking to a device
+
+    # Method to get (or create) the pool entry of a device
+    def entry(self, device):
+        key = device_key(device)
+        with self.lock:
+            if key not in self.entries:
+                self.entries[key] = {"conn": None, "lock": threading.Lock(), "last_used": time.monotonic()}
+            return self.entries[key]
+
+    # Method to check that a pooled session can still be used
+    def healthy(self, conn):
+        try:
+            if not conn.is_alive():
+                return False
+            if not conn.check_enable_mode():
+                conn.enable()  # Device dropped us out of privileged mode
+            return True
+        except Exception:
+            return False
+
+    # Method to close a session without letting errors escape
+    def close(self, conn):
+        try:
+            conn.disconnect()
+        except Exception:
+            pass
+
+    # Method to lock the pool entry of a device, retrying if it was evicted before the lock was taken
+    def acquire(self, device):
+        key = device_key(device)
+        while True:
+            entry = self.entry(device)
+            entry["lock"].acquire()
+            with self.lock:
+                if self.entries.get(key) is entry:
+                    return entry
+            entry["lock"].release()  # Evicted or closed in the meantime, start over with a fresh entry
+
+    # Context manager giving exclusive use of a device's session; operations on one device share one channel
+    @contextmanager
+    def session(self, device):
+        self.evict_idle()
+        entry = self.acquire(device)
+        try:
+            conn = entry["conn"]
+            if conn is not None and not self.healthy(conn):
+                print(f"[WARNING] Pooled session to {device['host']} is dead, reconnecting")
+                self.close(conn)
+                conn = entry["conn"] = None
+            if conn is None:
+                conn = entry["conn"] = self.connect(device)
+            try:
+                yield conn
+            except Exception:
+                self.close(conn)  # The channel may be mid-command, do not hand it out again
+                entry["conn"] = None
+                raise
+        finally:
+            entry["last_used"] = time.monotonic()
+            entry["lock"].release()
+
+    # Method to close sessions that have not been used for idle_timeout seconds
+    def evict_idle(self):
+        now = time.monotonic()
+        with self.lock:
+            idle = [(key, entry) for key, entry in self.entries.items() if now - entry["last_used"] > self.idle_timeout]
+        for key, entry in idle:
+            if entry["lock"].acquire(blocking=False):  # Skip sessions someone is using right now
+                try:
+                    if time.monotonic() - entry["last_used"] <= self.idle_timeout:
+                        continue  # Used between the scan and taking the lock
+                    if entry["conn"] is not None:
+                        self.close(entry["conn"])
+                        entry["conn"] = None
+                    with self.lock:
+                        if self.entries.get(key) is entry:
+                            del self.entries[key]
+                finally:
+                    entry["lock"].release()
+
+    # Method to close every pooled session
+    def close_all(self):
+        with self.lock:
+            entries = list(self.entries.values())
+            self.entries.clear()
+        for entry in entries:
+            with entry["lock"]:
+                if entry["conn"] is not None:
+                    self.close(entry["conn"])
+                    entry["conn"] = None
+
+# Pool shared by the scripts in this repository
+default_pool = ConnectionPool()
+atexit.register(default_pool.close_all)
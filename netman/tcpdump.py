@@ -0,0 +1,545 @@
+#!/usr/bin/env python3
+
+import argparse
+import ipaddress
+import os
+import struct
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from netman import metrics
+
+pcap_file = "capture.pcap"  # Capture to analyse
+pcap_suffixes = (".pcap", ".pcapng", ".cap")  # Files picked up from a directory of rotated captures
+
+# pcap file format constants
+pcap_magic_le = (b"\xd4\xc3\xb2\xa1", b"\x4d\x3c\xb2\xa1")  # Little-endian, microsecond / nanosecond timestamps
+pcap_magic_be = (b"\xa1\xb2\xc3\xd4", b"\xa1\xb2\x3c\x4d")  # Big-endian, microsecond / nanosecond timestamps
+pcapng_section_header = b"\x0a\x0d\x0d\x0a"  # First block of every pcapng section
+pcapng_byte_order_le = b"\x4d\x3c\x2b\x1a"  # Byte-order magic of a little-endian section
+pcapng_interface_block = 1  # Interface Description Block, carries the link type
+pcapng_simple_packet_block = 3
+pcapng_enhanced_packet_block = 6
+linktype_ethernet = 1
+linktype_raw = (101, 12)  # Raw IP, no link-layer header
+linktype_linux_sll = 113  # Linux cooked capture, what tcpdump -i any writes
+linktype_linux_sll2 = 276  # Linux cooked capture v2
+ethertype_ipv6 = b"\x86\xdd"
+ethertype_vlan = (b"\x81\x00", b"\x88\xa8")  # 802.1Q / 802.1ad tags
+icmpv6_next_header = 58
+icmpv6_echo_request = 128
+
+# Live capture settings
+neighbor_max_entries = 65536  # Upper bound on the IPv6 -> MAC table
+neighbor_ttl = 3600  # Seconds a neighbor stays in the table without being seen again
+follow_poll_interval = 0.5  # Seconds to wait for a growing capture file to get more data
+live_bpf_filter = "icmp6 and ip6[40] == 128"  # Kernel-side filter for ICMPv6 Echo Requests
+
+# Function to turn an IPv6 address (any textual form, or 16 raw bytes) into its 16 bytes
+def ipv6_to_bytes(address):
+    if isinstance(address, (bytes, bytearray)) and len(address) == 16:
+        return bytes(address)
+    try:
+        return ipaddress.IPv6Address(address).packed  # Handles compressed forms like fe80::c802:4cff:fe31:0
+    except ValueError:
+        return None
+
+# Function to turn a MAC address in any common notation into its 6 bytes
+def mac_to_bytes(mac):
+    digits = mac.replace(":", "").replace("-", "").replace(".", "")  # aa:bb:.., aa-bb-.., aabb.ccdd.eeff
+    if len(digits) != 12:
+        raise ValueError(f"invalid MAC address: {mac}")
+    return bytes.fromhex(digits)
+
+# Function to turn an (N, 16) array of IPv6 addresses into (N, 6) MAC bytes and a mask of EUI-64 addresses
+def eui64_to_mac_array(addresses):
+    addresses = np.asarray(addresses, dtype=np.uint8).reshape(-1, 16)
+    valid = (addresses[:, 11] == 0xFF) & (addresses[:, 12] == 0xFE)  # ff:fe marker in the middle of the interface ID
+    macs = addresses[:, [8, 9, 10, 13, 14, 15]]  # Fancy indexing returns a copy
+    macs[:, 0] ^= 0x02  # Flip the U/L bit back
+    return macs, valid
+
+# Function to convert many IPv6 addresses at once, returning a MAC string (or None) for each
+def eui64_to_mac_batch(addresses):
+    packed = [ipv6_to_bytes(address) for address in addresses]
+    parsed = [p for p in packed if p is not None]
+    if not parsed:
+        return [None] * len(packed)
+    macs, valid = eui64_to_mac_array(np.frombuffer(b"".join(parsed), dtype=np.uint8))
+    raw = macs.tobytes()
+    converted = iter(zip(range(0, len(raw), 6), valid.tolist()))  # One (offset, is EUI-64) pair per parsed address
+
+    results = []
+    for p in packed:
+        if p is None:
+            results.append(None)  # Not an IPv6 address at all
+            continue
+        offset, ok = next(converted)
+        results.append(raw[offset:offset + 6].hex(":") if ok else None)
+    return results
+
+# Function to convert one IPv6 address to the MAC address embedded in its EUI-64 interface ID
+def eui64_to_mac(address):
+    return eui64_to_mac_batch([address])[0]
+
+# Function to turn an (N, 6) array of MAC addresses into (N, 16) IPv6 addresses under a /64 prefix
+def mac_to_ipv6_array(macs, prefix="fe80::"):
+    macs = np.asarray(macs, dtype=np.uint8).reshape(-1, 6)
+    addresses = np.empty((len(macs), 16), dtype=np.uint8)
+    addresses[:, :8] = np.frombuffer(ipaddress.IPv6Address(prefix).packed[:8], dtype=np.uint8)  # Network half
+    addresses[:, 8:11] = macs[:, :3]
+    addresses[:, 11] = 0xFF  # EUI-64 marker
+    addresses[:, 12] = 0xFE
+    addresses[:, 13:] = macs[:, 3:]
+    addresses[:, 8] ^= 0x02  # Set the U/L bit
+    return addresses
+
+# Function to build the link-local (or SLAAC, with a global /64 prefix) address of each MAC
+def mac_to_ipv6_batch(macs, prefix="fe80::"):
+    raw = np.frombuffer(b"".join(mac_to_bytes(mac) for mac in macs), dtype=np.uint8)
+    addresses = mac_to_ipv6_array(raw, prefix).tobytes()
+    return [str(ipaddress.IPv6Address(addresses[i:i + 16])) for i in range(0, len(addresses), 16)]
+
+# Function to build the link-local (or SLAAC) address of one MAC
+def mac_to_ipv6(mac, prefix="fe80::"):
+    return mac_to_ipv6_batch([mac], prefix)[0]
+
+# Function to read the byte order and link type from a pcap global header
+def parse_pcap_header(header):
+    if header[:4] in pcap_magic_le:
+        endian = "<"
+    elif header[:4] in pcap_magic_be:
+        endian = ">"
+    else:
+        raise ValueError("not a classic pcap file")
+    linktype = struct.unpack(endian + "I", header[20:24])[0] & 0xFFFF  # Upper bits may carry FCS info
+    return endian, linktype
+
+# Function to read the raw records of a classic pcap file one at a time, optionally only those between two byte offsets
+def iter_pcap_records(f, start=None, end=None):
+    endian, linktype = parse_pcap_header(f.read(24))  # Global header
+    record_header = struct.Struct(endian + "IIII")
+    if start is not None:
+        f.seek(start)  # Shards always start on a record boundary
+
+    while end is None or f.tell() < end:
+        record = f.read(16)
+        if len(record) < 16:
+            return  # End of file (or a truncated record header)
+        _, _, incl_len, _ = record_header.unpack(record)
+        data = f.read(incl_len)
+        if len(data) < incl_len:
+            return  # Capture was cut off mid-packet
+        yield linktype, data
+
+# Function to read the packets of a pcapng file one at a time, without scapy
+def iter_pcapng_records(f):
+    endian = "<"
+    linktypes = []  # Interface ID -> link type, reset by every section header
+    while True:
+        header = f.read(8)
+        if len(header) < 8:
+            return  # End of file (or a truncated block header)
+        if header[:4] == pcapng_section_header:
+            magic = f.read(4)
+            endian = "<" if magic == pcapng_byte_order_le else ">"
+            linktypes = []
+            length = struct.unpack(endian + "I", header[4:])[0]
+            f.seek(length - 12, os.SEEK_CUR)  # Section options are not needed
+            continue
+        block_type, length = struct.unpack(endian + "II", header)
+        body = f.read(length - 8)  # Block body plus the trailing length copy
+        if length < 12 or len(body) < length - 8:
+            return  # Corrupt or cut off mid-block
+        if block_type == pcapng_interface_block:
+            linktypes.append(struct.unpack_from(endian + "H", body)[0])
+        elif block_type == pcapng_enhanced_packet_block:
+            interface, _, _, captured = struct.unpack_from(endian + "IIII", body)
+            if interface < len(linktypes):
+                yield linktypes[interface], body[20:20 + captured]
+        elif block_type == pcapng_simple_packet_block and linktypes:
+            original = struct.unpack_from(endian + "I", body)[0]
+            yield linktypes[0], body[4:4 + min(original, length - 16)]  # Captured length is implied by the block length
+
+# Function to read the records of a classic pcap or pcapng file, only classic files can be read by byte range
+def iter_capture_records(f, start=None, end=None):
+    magic = f.read(4)
+    f.seek(0)
+    if magic in pcap_magic_le + pcap_magic_be:
+        return iter_pcap_records(f, start, end)
+    if magic == pcapng_section_header:
+        return iter_pcapng_records(f)
+    raise ValueError("not a pcap or pcapng file")
+
+# Function to check the raw bytes for an ICMPv6 Echo Request without dissecting the packet
+def is_echo_request(linktype, data):
+    if linktype == linktype_ethernet:
+        offset = 12
+        while data[offset:offset + 2] in ethertype_vlan:
+            offset += 4  # Skip VLAN tags
+        if data[offset:offset + 2] != ethertype_ipv6:
+            return False
+        offset += 2
+    elif linktype in linktype_raw:
+        offset = 0
+    elif linktype == linktype_linux_sll:
+        if data[14:16] != ethertype_ipv6:  # Protocol field closes the 16-byte header
+            return False
+        offset = 16
+    elif linktype == linktype_linux_sll2:
+        if data[0:2] != ethertype_ipv6:  # Protocol field opens the 20-byte header
+            return False
+        offset = 20
+    else:
+        return True  # Unknown link type, let scapy decide
+    # IPv6 next header at +6, ICMPv6 type right after the 40-byte IPv6 header
+    return len(data) > offset + 40 and data[offset + 6] == icmpv6_next_header and data[offset + 40] == icmpv6_echo_request
+
+# Function to dissect a raw packet that passed the prefilter
+def dissect(linktype, data):
+    from scapy.all import IPv6, Ether  # scapy takes seconds to import, so only load it once a packet needs it
+    if linktype == linktype_ethernet:
+        return Ether(data)
+    if linktype in linktype_raw:
+        return IPv6(data)
+    if linktype == linktype_linux_sll:
+        from scapy.layers.l2 import CookedLinux
+        return CookedLinux(data)
+    from scapy.all import conf
+    layer = conf.l2types.get(linktype, conf.raw_layer)  # scapy's own link type registry (SLL2, 802.11, ...)
+    return layer(data)
+
+# Function to remember the source address of an ICMPv6 Echo Request
+def process_packet(pkt, sources):
+    from scapy.all import IPv6, ICMPv6EchoRequest
+    if pkt.haslayer(IPv6) and pkt.haslayer(ICMPv6EchoRequest):
+        sources.setdefault(pkt[IPv6].src, None)  # Ordered set of source IPv6 addresses
+
+# Function to convert the collected source addresses to MAC addresses in one batch
+def sources_to_macs(sources, verbose=True):
+    macs = {}  # Dictionary to store extracted MAC addresses
+    for src_ipv6, mac_address in zip(sources, eui64_to_mac_batch(list(sources))):
+        if mac_address:
+            macs[src_ipv6] = mac_address
+            if verbose:
+                print(f"Extracted: IPv6={src_ipv6} -> MAC={mac_address}")
+    return macs
+
+# Function to check whether a file is a classic pcap (as opposed to pcapng)
+def is_classic_pcap(path):
+    with open(path, "rb") as f:
+        return f.read(4) in pcap_magic_le + pcap_magic_be
+
+# Function to stream a capture (or one byte range of it) and return (macs, packet count)
+def scan_capture(path, start=None, end=None, verbose=True):
+    start_time = time.perf_counter()
+    with metrics.timed("pcap_scan", capture=os.path.basename(path)):
+        macs, packets = read_capture(path, start, end, verbose)
+    record_packet_rate(os.path.basename(path), packets, time.perf_counter() - start_time)
+    return macs, packets
+
+# Function to publish the packet count and rate of a finished scan
+def record_packet_rate(capture, packets, elapsed):
+    metrics.increment("netman_packets_total", packets, capture=capture)
+    if elapsed > 0:
+        metrics.set_gauge("netman_packets_per_second", packets / elapsed, capture=capture)
+
+# Function to read a capture (or one byte range of it) and return (macs, packet count)
+def read_capture(path, start=None, end=None, verbose=True):
+    sources = {}  # Unique source addresses, converted in one batch at the end
+    packets = 0
+    with open(path, "rb") as f:
+        for linktype, data in iter_capture_records(f, start, end):  # pcapng goes through the same prefilter
+            packets += 1
+            if is_echo_request(linktype, data):  # Cheap byte check first
+                process_packet(dissect(linktype, data), sources)  # Full dissection only for candidates
+    return sources_to_macs(sources, verbose), packets
+
+# Function to stream a capture and extract MAC addresses with constant memory
+def extract_macs(path):
+    return scan_capture(path)[0]
+
+# Function to split a classic pcap into byte ranges of similar size that start on record boundaries
+def shard_pcap(path, shards):
+    size = os.path.getsize(path)
+    target = max(size // max(shards, 1), 1)  # Bytes per shard
+    with open(path, "rb") as f:
+        endian = "<" if f.read(4) in pcap_magic_le else ">"
+        f.seek(24)
+        record_header = struct.Struct(endian + "IIII")
+        ranges = []
+        start = offset = 24
+        while True:
+            record = f.read(16)
+            if len(record) < 16:
+                break
+            offset += 16 + record_header.unpack(record)[2]  # Skip over the packet data
+            f.seek(offset)
+            if offset - start >= target:
+                ranges.append((start, offset))
+                start = offset
+        if start < min(offset, size):
+            ranges.append((start, min(offset, size)))
+    return ranges
+
+# Function used by the worker processes, their metrics stay in the worker so the parent records the totals
+def scan_job(job):
+    path, start, end = job
+    return read_capture(path, start, end, verbose=False)
+
+# Function to list the jobs for a capture file or a directory of rotated captures
+def plan_jobs(target, workers):
+    if os.path.isdir(target):
+        files = sorted(os.path.join(target, name) for name in os.listdir(target) if name.endswith(pcap_suffixes) or ".pcap" in name)  # Also matches rotated names like capture.pcap.3
+    else:
+        files = [target]
+    jobs = []
+    for path in files:
+        if len(files) < workers and is_classic_pcap(path):
+            jobs.extend((path, start, end) for start, end in shard_pcap(path, workers))  # Split big files across workers
+        else:
+            jobs.append((path, None, None))  # One job per whole file
+    return jobs
+
+# Function to extract MAC addresses with several processes and merge the results
+def extract_macs_parallel(target, workers=None):
+    workers = workers or os.cpu_count() or 1
+    jobs = plan_jobs(target, workers)
+    macs = {}
+    packets = 0
+    start_time = time.monotonic()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for shard_macs, shard_packets in pool.map(scan_job, jobs):  # Results come back in job order
+            packets += shard_packets
+            for ipv6, mac in shard_macs.items():
+                macs.setdefault(ipv6, mac)  # Deduplicate, keeping the first capture's mapping
+    elapsed = time.monotonic() - start_time
+    metrics.observe("netman_operation_seconds", elapsed, operation="pcap_scan", capture=os.path.basename(target.rstrip(os.sep)))
+    record_packet_rate(os.path.basename(target.rstrip(os.sep)), packets, elapsed)
+    rate = packets / elapsed if elapsed > 0 else 0.0
+    print(f"Processed {packets} packets from {len(jobs)} shard(s) with {workers} worker(s) in {elapsed:.2f}s ({rate:.0f} packets/s)")
+    return macs
+
+# LRU table of IPv6 -> MAC mappings with a size cap and a time-to-live
+class NeighborTable:
+    def __init__(self, max_entries=None, ttl=None, on_change=None):
+        self.max_entries = max_entries or neighbor_max_entries
+        self.ttl = ttl or neighbor_ttl
+        self.on_change = on_change  # Callback(event, ipv6, mac), event is new/changed/expired/evicted
+        self.entries = OrderedDict()  # ipv6 -> (mac, last_seen), least recently seen first
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    # Method to publish a change to the callback
+    def publish(self, event, ipv6, mac):
+        if self.on_change:
+            self.on_change(event, ipv6, mac)
+
+    # Method to record that ipv6 was seen with mac
+    def update(self, ipv6, mac, now=None):
+        now = now if now is not None else time.monotonic()
+        events = []
+        with self.lock:
+            previous = self.entries.pop(ipv6, None)
+            self.entries[ipv6] = (mac, now)  # Re-inserting moves it to the most recent end
+            if previous is None:
+                events.append(("new", ipv6, mac))
+            elif previous[0] != mac:
+                events.append(("changed", ipv6, mac))
+            while len(self.entries) > self.max_entries:
+                old_ipv6, (old_mac, _) = self.entries.popitem(last=False)  # Drop the least recently seen
+                events.append(("evicted", old_ipv6, old_mac))
+            events.extend(self.expire_locked(now))
+        for event in events:
+            self.publish(*event)
+
+    # Method to drop entries that have not been seen within the TTL (caller holds the lock)
+    def expire_locked(self, now):
+        events = []
+        while self.entries:
+            ipv6, (mac, last_seen) = next(iter(self.entries.items()))
+            if now - last_seen < self.ttl:
+                break  # Entries are ordered by last_seen, the rest are fresh
+            del self.entries[ipv6]
+            events.append(("expired", ipv6, mac))
+        return events
+
+    # Method to drop expired entries
+    def expire(self, now=None):
+        with self.lock:
+            events = self.expire_locked(now if now is not None else time.monotonic())
+        for event in events:
+            self.publish(*event)
+
+    # Method to copy out the current mappings
+    def snapshot(self):
+        with self.lock:
+            return {ipv6: mac for ipv6, (mac, _) in self.entries.items()}
+
+# Function to feed one packet into a neighbor table
+def learn_packet(pkt, table):
+    from scapy.all import IPv6, ICMPv6EchoRequest
+    if pkt.haslayer(IPv6) and pkt.haslayer(ICMPv6EchoRequest):
+        src_ipv6 = pkt[IPv6].src
+        mac_address = eui64_to_mac(src_ipv6)
+        if mac_address:
+            table.update(src_ipv6, mac_address)
+
+# Function to read records from a pcap file that is still being written, until stop_event is set
+def follow_pcap_records(path, stop_event, poll_interval=None, on_idle=None):
+    poll_interval = poll_interval or follow_poll_interval
+    while not os.path.exists(path) or os.path.getsize(path) < 24:
+        if stop_event.wait(poll_interval):
+            return  # Stopped before the writer produced a header
+    with open(path, "rb") as f:
+        endian, linktype = parse_pcap_header(f.read(24))
+        record_header = struct.Struct(endian + "IIII")
+        while not stop_event.is_set():
+            position = f.tell()
+            record = f.read(16)
+            if len(record) == 16:
+                incl_len = record_header.unpack(record)[2]
+                data = f.read(incl_len)
+                if len(data) == incl_len:
+                    yield linktype, data
+                    continue
+            f.seek(position)  # Partial record, wait for the writer to finish it
+            if on_idle:
+                on_idle()  # Quiet captures still need housekeeping
+            stop_event.wait(poll_interval)
+
+# Function to keep a neighbor table up to date from a growing capture file
+def follow_capture(path, table, stop_event=None):
+    stop_event = stop_event or threading.Event()
+    gauge = metrics.RateGauge(capture=os.path.basename(path))
+
+    # Function run whenever the capture has no new packet: neighbors still expire and the rate drops to 0
+    def idle():
+        table.expire()
+        gauge.flush()
+
+    try:
+        for linktype, data in follow_pcap_records(path, stop_event, on_idle=idle):
+            gauge.tick()
+            if is_echo_request(linktype, data):
+                learn_packet(dissect(linktype, data), table)
+    finally:
+        gauge.flush(final=True)  # Packets of the last partial window still reach the counters, also on Ctrl-C
+    return table
+
+# Function to run housekeeping actions from a background thread until stop_event is set
+def run_periodically(stop_event, interval, *actions):
+
+    # Function run by the background sweeper
+    def sweeper():
+        while not stop_event.wait(interval):
+            for action in actions:
+                action()
+
+    thread = threading.Thread(target=sweeper, daemon=True)
+    thread.start()
+    return thread
+
+# Function to keep a neighbor table up to date from a live interface
+def capture_live(iface, table, stop_event=None):
+    from scapy.all import sniff
+    stop_event = stop_event or threading.Event()
+    gauge = metrics.RateGauge(capture=iface)  # Counts the Echo Requests that pass the BPF filter
+    sweeper_stop = threading.Event()
+    run_periodically(sweeper_stop, gauge.window, table.expire, gauge.flush)  # sniff() blocks between packets, so neither can wait for the next one
+
+    # Function called by scapy for every captured packet
+    def handle(pkt):
+        gauge.tick()
+        learn_packet(pkt, table)
+
+    try:
+        sniff(
+            iface=iface,
+            filter=live_bpf_filter,  # Only Echo Requests reach Python
+            prn=handle,
+            store=False,  # Do not keep packets in memory
+            stop_filter=lambda pkt: stop_event.is_set()
+        )
+    finally:
+        sweeper_stop.set()
+        gauge.flush(final=True)
+    return table
+
+# Function to copy a capture into another file at a fixed packet rate (for exercising follow mode)
+def replay_pcap(source, destination, rate=100.0):
+    with open(source, "rb") as src, open(destination, "wb") as dst:
+        header = src.read(24)
+        endian, _ = parse_pcap_header(header)
+        record_header = struct.Struct(endian + "IIII")
+        dst.write(header)
+        dst.flush()
+        start = time.monotonic()
+        count = 0
+        while True:
+            record = src.read(16)
+            if len(record) < 16:
+                break
+            data = src.read(record_header.unpack(record)[2])
+            delay = start + count / rate - time.monotonic()  # Fixed schedule, no drift
+            if delay > 0:
+                time.sleep(delay)
+            dst.write(record + data)
+            dst.flush()
+            count += 1
+    return count
+
+# Function to print neighbor table changes as they happen
+def print_neighbor_change(event, ipv6, mac):
+    print(f"[{event.upper()}] IPv6={ipv6} -> MAC={mac}")
+
+# Function to run the extractor from the command line
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Extract EUI-64 MAC addresses from ICMPv6 Echo Requests")
+    parser.add_argument("capture", nargs="?", default=pcap_file, help="pcap/pcapng file or directory of rotated captures")
+    parser.add_argument("--workers", type=int, default=1, help="number of worker processes (default: 1)")
+    parser.add_argument("--live", metavar="IFACE", help="capture continuously from an interface")
+    parser.add_argument("--follow", action="store_true", help="keep reading the capture file as it grows")
+    parser.add_argument("--max-entries", type=int, default=neighbor_max_entries, help="neighbor table size cap")
+    parser.add_argument("--ttl", type=float, default=neighbor_ttl, help="seconds before an unseen neighbor expires")
+    args = parser.parse_args(argv)
+
+    # Continuous modes run until interrupted and publish every change
+    if args.live or args.follow:
+        table = NeighborTable(args.max_entries, args.ttl, on_change=print_neighbor_change)
+        try:
+            if args.live:
+                capture_live(args.live, table)
+            else:
+                follow_capture(args.capture, table)
+        except KeyboardInterrupt:
+            pass
+        except ValueError as e:
+            print(f"[ERROR] Cannot follow {args.capture}: {e}, follow mode needs a classic pcap (tcpdump -w)")
+            return 1
+        print(f"\n{len(table)} neighbor(s) in table")
+        return 0
+
+    # Parse packets and extract ICMPv6 Echo Requests
+    try:
+        if args.workers > 1 or os.path.isdir(args.capture):
+            r2_r3_macs = extract_macs_parallel(args.capture, args.workers)
+        else:
+            r2_r3_macs = extract_macs(args.capture)
+    except (OSError, ValueError) as e:
+        print(f"[ERROR] Cannot read {args.capture}: {e}")
+        return 1
+    # Print the final extracted MAC addresses
+    print("\nExtracted MAC addresses for R2-F0/0 and R3-F0/0:")
+    if r2_r3_macs:
+        for ipv6, mac in r2_r3_macs.items():
+            print(f"IPv6: {ipv6} -> MAC: {mac}")
+    else:
+        print("No matching MAC addresses found. Check pcap file and ICMPv6 requests.")
+
+if __name__ == "__main__":
+    main()
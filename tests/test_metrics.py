@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+
+import pytest
+
+from netman import metrics
+
+# Fixture giving a clean registry and a clock the test moves by hand
+@pytest.fixture
+def clock(monkeypatch):
+    monkeypatch.setattr(metrics, "counters", {})
+    monkeypatch.setattr(metrics, "gauges", {})
+    now = [100.0]
+    monkeypatch.setattr(metrics.time, "monotonic", lambda: now[0])
+    return now
+
+# Function to read the rate and total of the test capture
+def published():
+    labels = metrics.label_key({"capture": "test"})
+    return metrics.gauges.get(("netman_packets_per_second", labels)), metrics.counters.get(("netman_packets_total", labels), 0)
+
+def test_rate_gauge_drops_to_zero_when_idle(clock):
+    gauge = metrics.RateGauge(window=1, capture="test")
+    gauge.tick(5)
+    clock[0] += 1
+    gauge.tick(5)
+    assert published() == (10.0, 10)
+    clock[0] += 0.5
+    gauge.flush()
+    assert published() == (10.0, 10)  # Window not over yet
+    clock[0] += 0.5
+    gauge.flush()
+    assert published() == (0.0, 10)  # Quiet window
+
+def test_rate_gauge_final_flush_counts_partial_window(clock):
+    gauge = metrics.RateGauge(window=1, capture="test")
+    gauge.tick(3)
+    clock[0] += 0.25
+    gauge.flush(final=True)
+    assert published() == (12.0, 3)
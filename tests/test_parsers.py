@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+
+from netman.parsers import DhcpBinding, Neighbor, client_id_to_mac, parse_dhcp_bindings, parse_ipv6_neighbors
+
+# "show ip dhcp binding" from a classic IOS release, with a text client ID wrapped over four lines
+classic_bindings = """R5#show ip dhcp binding
+Bindings from all pools not associated with VRF:
+IP address          Client-ID/              Lease expiration        Type
+                    Hardware address/
+                    User name
+40.0.0.2            01ca.024c.3100.00       Infinite                Manual
+40.0.0.4            0063.6973.636f.2d63.    Mar 02 2026 12:15 AM    Automatic
+                    6130.342e.3463.3932.
+                    2e30.3030.302d.4661.
+                    302f.30
+40.0.0.5            ca03.4c50.0000          Infinite                Manual
+R5#
+"""
+
+# Newer IOS releases add the State and Interface columns
+newer_bindings = """Bindings from all pools not associated with VRF:
+IP address      Client-ID/              Lease expiration        Type       State      Interface
+                Hardware address/
+                User name
+192.168.1.10    0100.5079.6668.00       Oct 18 2026 10:15 AM    Automatic  Active     GigabitEthernet0/1\r
+192.168.1.11    0100.5079.6668.01       Oct 18 2026 10:20 AM    Automatic  Selecting  Unknown\r
+"""
+
+# "show ipv6 neighbors" with a static entry and an incomplete one
+neighbors_output = """R4#show ipv6 neighbors
+IPv6 Address                              Age Link-layer Addr State Interface
+2001:DB8:1::5                               0 ca05.4c8c.0000  REACH Fa0/0
+FE80::C805:4CFF:FE8C:0                      - CA05.4C8C.0008  REACH Fa0/0
+2001:DB8:1::9                               2 -               INCMP Fa0/0
+R4#
+"""
+
+def test_classic_bindings():
+    assert parse_dhcp_bindings(classic_bindings) == [
+        DhcpBinding("40.0.0.2", "01ca.024c.3100.00", "ca02.4c31.0000", "Infinite", "Manual", None, None),
+        DhcpBinding(
+            "40.0.0.4",
+            "0063.6973.636f.2d63.6130.342e.3463.3932.2e30.3030.302d.4661.302f.30",  # Joined across the wrapped lines
+            None,  # Text client ID, not a MAC
+            "Mar 02 2026 12:15 AM",  # The date stays the lease, it is not read as an address
+            "Automatic",
+            None,
+            None
+        ),
+        DhcpBinding("40.0.0.5", "ca03.4c50.0000", "ca03.4c50.0000", "Infinite", "Manual", None, None)
+    ]
+
+def test_header_lines_are_not_rows():
+    header = "\n".join(classic_bindings.splitlines()[:5])
+    assert parse_dhcp_bindings(header) == []
+    assert parse_ipv6_neighbors(neighbors_output.splitlines()[1]) == []
+
+def test_newer_bindings_with_state_and_interface():
+    assert parse_dhcp_bindings(newer_bindings) == [
+        DhcpBinding("192.168.1.10", "0100.5079.6668.00", "0050.7966.6800", "Oct 18 2026 10:15 AM", "Automatic", "Active", "GigabitEthernet0/1"),
+        DhcpBinding("192.168.1.11", "0100.5079.6668.01", "0050.7966.6801", "Oct 18 2026 10:20 AM", "Automatic", "Selecting", "Unknown")
+    ]
+
+def test_client_id_to_mac():
+    assert client_id_to_mac("01ca.024c.3100.00") == "ca02.4c31.0000"  # Type 01 prefix dropped
+    assert client_id_to_mac("CA03.4C50.0000") == "ca03.4c50.0000"
+    assert client_id_to_mac("0063.6973.636f.2d63.6130") is None
+
+def test_ipv6_neighbors():
+    assert parse_ipv6_neighbors(neighbors_output) == [
+        Neighbor("2001:DB8:1::5", 0, "ca05.4c8c.0000", "REACH", "Fa0/0"),
+        Neighbor("FE80::C805:4CFF:FE8C:0", None, "ca05.4c8c.0008", "REACH", "Fa0/0"),  # "-" age of a static entry
+        Neighbor("2001:DB8:1::9", 2, None, "INCMP", "Fa0/0")  # No link-layer address yet
+    ]
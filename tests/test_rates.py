@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+
+import numpy as np
+import pytest
+
+from netman import rates, simulator
+
+# Function to make a store with a 10s interval and poll interfaces 1 and 2 once as the baseline
+@pytest.fixture
+def store():
+    store = rates.InterfaceRateStore(capacity=8, interval=10)
+    assert store.update("R1", [1, 2], [1000, 5000], [0, 0], uptime=100, timestamp=0) == 0  # No rate from the first poll
+    return store
+
+def test_rate_from_two_polls(store):
+    assert store.update("R1", [1, 2], [2250, 5000], [125, 0], uptime=1100, timestamp=10) == 2
+    times, in_bps, out_bps = store.rates("R1", 1)
+    assert times.tolist() == [10]
+    assert in_bps.tolist() == [1000.0]  # 1250 bytes in 10s
+    assert out_bps.tolist() == [100.0]
+
+def test_counter_wrap_is_a_rate(store):
+    top = 2 ** 64 - 250
+    store.update("R1", [1], [top], [0], uptime=1100, timestamp=10)
+    assert store.update("R1", [1], [1000], [0], uptime=2100, timestamp=20) == 1
+    assert store.rates("R1", 1)[1][-1] == 1000.0  # 250 bytes to the wrap and 1000 after it
+
+def test_counter_drop_without_wrap_rebaselines(store):
+    assert store.update("R1", [1], [10], [0], uptime=1100, timestamp=10) == 0  # Counter reset, not a wrap
+    assert len(store.rates("R1", 1)[0]) == 0
+    assert store.update("R1", [1], [1260], [0], uptime=2100, timestamp=20) == 1  # New baseline is used
+    assert store.rates("R1", 1)[1].tolist() == [1000.0]
+
+def test_uptime_reset_rebaselines(store):
+    assert store.update("R1", [1, 2], [90000, 90000], [0, 0], uptime=50, timestamp=10) == 0  # Rebooted, counters are not comparable
+    assert len(store.rates("R1", 1)[0]) == 0
+    assert len(store.rates("R1", 2)[0]) == 0
+
+def test_gap_longer_than_max_sample_gap_is_skipped(store):
+    gap = rates.max_sample_gap * 10 + 1
+    assert store.update("R1", [1], [2000], [0], uptime=100 + gap * 100, timestamp=gap) == 0
+    assert store.update("R1", [1], [3250], [0], uptime=1100 + gap * 100, timestamp=gap + 10) == 1
+    assert store.rates("R1", 1)[1].tolist() == [1000.0]
+
+def test_unknown_interface_read_does_not_allocate(store):
+    rows = store.rows
+    for router, if_index in (("R1", 3), ("R9", 1)):
+        times, in_bps, out_bps = store.rates(router, if_index)
+        assert len(times) == len(in_bps) == len(out_bps) == 0
+    assert store.rows == rows
+    assert "R9" not in store.index
+
+def test_walk_counters_fills_buffers_from_getbulk():
+    interfaces = [{"if_index": if_index, "name": f"Gi0/{if_index}", "status": "Up"} for if_index in (3, 1, 200, 7)]
+    agent = simulator.SimulatedAgent("R1", "192.0.2.1", interfaces, latency=0)
+    session = simulator.SimulatedSession(agent, engine_id="known")
+    buffers = rates.CounterWalkBuffers(size=2)  # Forces the buffers to grow during the walk
+    rates.walk_counters(session, buffers, repetitions=3)
+    if_indexes, in_octets, out_octets = buffers.table()
+    assert if_indexes.tolist() == [1, 3, 7, 200]
+    assert in_octets.dtype == np.uint64 and len(in_octets) == len(out_octets) == 4
+    assert buffers.uptime is not None
+    assert agent.requests == 2  # 4 rows at 3 repetitions per PDU, sysUpTime included in the first one
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+
+import json
+import os
+
+from netman.snmp import changes_log, diff_sections, save_snapshot, snapshot_index
+
+# Function to build the collected data of one router in the shape fetch_router_data() returns
+def inventory(addresses, statuses):
+    return {"R1": {"addresses": addresses}}, {"R1": statuses}
+
+baseline_addresses = {
+    "Fa0/0": {"v4": "10.0.0.1", "v6": ["2001:0db8:0000:0000:0000:0000:0000:0001"]},
+    "Gi2/0": {"v4": "10.0.1.1"}
+}
+baseline_statuses = {"Fa0/0": "Up", "Gi2/0": "Up", "Fa1/0": "Down"}
+
+# Function to read the structured change log of a snapshot directory
+def logged_changes(directory):
+    path = os.path.join(directory, changes_log)
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+def test_first_snapshot_is_a_baseline(tmp_path):
+    assert save_snapshot(*inventory(baseline_addresses, baseline_statuses), directory=str(tmp_path)) == []
+    assert logged_changes(tmp_path) == []
+    with open(tmp_path / "R1.json") as f:
+        assert json.load(f) == {"addresses": baseline_addresses, "interface_status": baseline_statuses}
+    with open(tmp_path / snapshot_index) as f:
+        assert set(json.load(f)) == {"R1"}
+
+def test_unchanged_router_is_skipped(tmp_path):
+    save_snapshot(*inventory(baseline_addresses, baseline_statuses), directory=str(tmp_path))
+    os.remove(tmp_path / "R1.json")  # Only the digest index is consulted for unchanged routers
+    assert save_snapshot(*inventory(baseline_addresses, baseline_statuses), directory=str(tmp_path)) == []
+    assert not os.path.exists(tmp_path / "R1.json")
+
+def test_changes_are_returned_and_logged(tmp_path):
+    save_snapshot(*inventory(baseline_addresses, baseline_statuses), directory=str(tmp_path))
+    addresses = {
+        "Fa0/0": {"v4": "10.0.0.1", "v6": ["2001:0db8:0000:0000:0000:0000:0000:0002"]},  # v6 replaced
+        "Gi2/0": {"v4": "10.0.2.1"}  # v4 replaced
+    }
+    statuses = {"Fa0/0": "Up", "Gi2/0": "Down"}  # Gi2/0 flips, Fa1/0 disappears
+    changes = save_snapshot(*inventory(addresses, statuses), directory=str(tmp_path))
+    assert changes == [{
+        "router": "R1",
+        "added_addresses": [
+            {"interface": "Fa0/0", "family": "v6", "address": "2001:0db8:0000:0000:0000:0000:0000:0002"},
+            {"interface": "Gi2/0", "family": "v4", "address": "10.0.2.1"}
+        ],
+        "removed_addresses": [
+            {"interface": "Fa0/0", "family": "v6", "address": "2001:0db8:0000:0000:0000:0000:0000:0001"},
+            {"interface": "Gi2/0", "family": "v4", "address": "10.0.1.1"}
+        ],
+        "status_changes": [
+            {"interface": "Gi2/0", "from": "Up", "to": "Down"},
+            {"interface": "Fa1/0", "from": "Down", "to": None}
+        ]
+    }]
+    logged = logged_changes(tmp_path)
+    assert len(logged) == 1
+    assert {key: value for key, value in logged[0].items() if key != "time"} == changes[0]
+
+def test_router_missing_from_a_cycle_keeps_its_snapshot(tmp_path):
+    save_snapshot(*inventory(baseline_addresses, baseline_statuses), directory=str(tmp_path))
+    assert save_snapshot({}, {}, directory=str(tmp_path)) == []
+    assert os.path.exists(tmp_path / "R1.json")
+
+def test_diff_of_a_new_interface():
+    old = {"addresses": {}, "interface_status": {"Fa0/0": "Up"}}
+    new = {"addresses": {"Fa1/1": {"v4": "10.0.3.1"}}, "interface_status": {"Fa0/0": "Up", "Fa1/1": "Up"}}
+    assert diff_sections("R2", old, new) == {
+        "router": "R2",
+        "added_addresses": [{"interface": "Fa1/1", "family": "v4", "address": "10.0.3.1"}],
+        "removed_addresses": [],
+        "status_changes": [{"interface": "Fa1/1", "from": None, "to": "Up"}]
+    }
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+
+import threading
+
+import pytest
+
+from netman import sshpool
+
+device = {"host": "192.0.2.1", "username": "admin", "device_type": "cisco_ios"}
+
+# Stand-in for a Netmiko connection, recording what the pool does with it
+class FakeConnection:
+    def __init__(self, device):
+        self.host = device["host"]
+        self.alive = True
+        self.enabled = True
+        self.enable_calls = 0
+        self.disconnected = False
+
+    def is_alive(self):
+        return self.alive
+
+    def check_enable_mode(self):
+        return self.enabled
+
+    def enable(self):
+        self.enable_calls += 1
+        self.enabled = True
+
+    def disconnect(self):
+        self.disconnected = True
+
+# Connection factory keeping every connection it opened
+class FakeConnector:
+    def __init__(self):
+        self.opened = []
+
+    def __call__(self, device):
+        conn = FakeConnection(device)
+        self.opened.append(conn)
+        return conn
+
+@pytest.fixture
+def connector():
+    return FakeConnector()
+
+@pytest.fixture
+def pool(connector):
+    return sshpool.ConnectionPool(idle_timeout_seconds=60, connect=connector)
+
+def test_session_is_reused(pool, connector):
+    with pool.session(device) as first:
+        pass
+    with pool.session(device) as second:
+        pass
+    assert first is second
+    assert len(connector.opened) == 1
+
+def test_dead_session_is_replaced(pool, connector):
+    with pool.session(device) as first:
+        pass
+    first.alive = False
+    with pool.session(device) as second:
+        pass
+    assert second is not first
+    assert first.disconnected
+    assert len(connector.opened) == 2
+
+def test_session_out_of_enable_mode_is_re_enabled(pool, connector):
+    with pool.session(device) as first:
+        pass
+    first.enabled = False
+    with pool.session(device) as second:
+        pass
+    assert second is first
+    assert first.enable_calls == 1
+
+def test_session_is_dropped_after_an_error(pool, connector):
+    with pytest.raises(RuntimeError):
+        with pool.session(device) as first:
+            raise RuntimeError("command timed out")
+    assert first.disconnected
+    with pool.session(device) as second:
+        pass
+    assert second is not first
+
+def test_idle_sessions_are_evicted(pool, connector, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(sshpool.time, "monotonic", lambda: clock[0])
+    with pool.session(device) as first:
+        pass
+    clock[0] += 30
+    pool.evict_idle()
+    assert not first.disconnected  # Still within the idle timeout
+    clock[0] += 31
+    pool.evict_idle()
+    assert first.disconnected
+    assert pool.entries == {}
+
+def test_busy_session_is_not_evicted(pool, connector, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(sshpool.time, "monotonic", lambda: clock[0])
+    with pool.session(device) as conn:
+        clock[0] += 120
+        pool.evict_idle()
+        assert not conn.disconnected
+    pool.evict_idle()  # Just released, so no longer idle
+    assert not conn.disconnected
+
+def test_session_survives_eviction_of_its_entry(pool, connector):
+    with pool.session(device):
+        pass
+    stale = pool.entry(device)
+    stale["lock"].acquire()  # Hold the entry as evict_idle() would while closing it
+    acquired = threading.Event()
+
+    # Function opening a session while the entry is being evicted
+    def use_session():
+        with pool.session(device):
+            acquired.set()
+
+    worker = threading.Thread(target=use_session)
+    worker.start()
+    assert not acquired.wait(0.1)  # Waiting for the stale entry's lock
+    with pool.lock:
+        del pool.entries[sshpool.device_key(device)]  # Eviction finishes
+    stale["lock"].release()
+    worker.join(5)
+    assert acquired.is_set()
+    assert pool.entries[sshpool.device_key(device)] is not stale
+    assert len(connector.opened) == 2  # Fresh entry, fresh connection
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+
+import ipaddress
+import struct
+import threading
+import time
+
+import pytest
+
+from netman import tcpdump
+
+# Neighbors in the synthetic capture, in the order they send Echo Requests
+neighbor_macs = ["00:11:22:33:44:01", "00:11:22:33:44:02", "00:11:22:33:44:03"]
+
+# Function to build one Ethernet frame carrying an ICMPv6 Echo Request from a MAC's link-local address
+def echo_request_frame(mac):
+    source = bytes.fromhex(mac.replace(":", ""))
+    ipv6_src = ipaddress.IPv6Address(tcpdump.mac_to_ipv6(mac)).packed
+    ipv6_dst = ipaddress.IPv6Address("ff02::1").packed
+    icmpv6 = bytes([tcpdump.icmpv6_echo_request, 0, 0, 0, 0, 1, 0, 1])  # Type, code, checksum, id, sequence
+    ipv6 = b"\x60\x00\x00\x00" + struct.pack(">HBB", len(icmpv6), tcpdump.icmpv6_next_header, 64) + ipv6_src + ipv6_dst
+    return b"\x33\x33\x00\x00\x00\x01" + source + tcpdump.ethertype_ipv6 + ipv6 + icmpv6
+
+# Function to write a classic little-endian Ethernet pcap
+def write_pcap(path, frames):
+    with open(path, "wb") as f:
+        f.write(struct.pack("<IHHiIII", 0xA1B2C3D4, 2, 4, 0, 0, 65535, tcpdump.linktype_ethernet))
+        for frame in frames:
+            f.write(struct.pack("<IIII", 0, 0, len(frame), len(frame)) + frame)
+
+# Function to build one pcapng block, padding the body to 32 bits
+def pcapng_block(block_type, body):
+    body += b"\x00" * (-len(body) % 4)
+    return struct.pack("<II", block_type, len(body) + 12) + body + struct.pack("<I", len(body) + 12)
+
+# Function to write a little-endian pcapng with one Ethernet interface and one Enhanced Packet Block per frame
+def write_pcapng(path, frames):
+    with open(path, "wb") as f:
+        section = struct.pack("<IHHq", 0x1A2B3C4D, 1, 0, -1)  # Byte-order magic, version 1.0, unknown section length
+        f.write(tcpdump.pcapng_section_header + struct.pack("<I", len(section) + 12) + section + struct.pack("<I", len(section) + 12))
+        f.write(pcapng_block(tcpdump.pcapng_interface_block, struct.pack("<HHI", tcpdump.linktype_ethernet, 0, 65535)))
+        for frame in frames:
+            f.write(pcapng_block(tcpdump.pcapng_enhanced_packet_block, struct.pack("<IIIII", 0, 0, 0, len(frame), len(frame)) + frame))
+
+def test_prefilter_accepts_echo_requests_only():
+    frame = echo_request_frame(neighbor_macs[0])
+    assert tcpdump.is_echo_request(tcpdump.linktype_ethernet, frame)
+    assert not tcpdump.is_echo_request(tcpdump.linktype_ethernet, frame[:54] + b"\x81" + frame[55:])  # Echo Reply
+    cooked = b"\x00" * 14 + frame[12:]  # Same packet behind a Linux cooked capture header
+    assert tcpdump.is_echo_request(tcpdump.linktype_linux_sll, cooked)
+
+def test_neighbor_table_caps_and_expires():
+    events = []
+    table = tcpdump.NeighborTable(max_entries=2, ttl=10, on_change=lambda *event: events.append(event))
+    table.update("fe80::1", "aa", now=0)
+    table.update("fe80::2", "bb", now=1)
+    table.update("fe80::1", "cc", now=2)
+    table.update("fe80::3", "dd", now=3)
+    assert len(table) == 2
+    table.expire(now=12.5)
+    assert events == [
+        ("new", "fe80::1", "aa"),
+        ("new", "fe80::2", "bb"),
+        ("changed", "fe80::1", "cc"),
+        ("new", "fe80::3", "dd"),
+        ("evicted", "fe80::2", "bb"),
+        ("expired", "fe80::1", "cc")
+    ]
+    assert table.snapshot() == {"fe80::3": "dd"}
+
+def test_follow_capture_publishes_new_evicted_and_expired(tmp_path, monkeypatch):
+    pytest.importorskip("scapy.all")
+    monkeypatch.setattr(tcpdump, "follow_poll_interval", 0.05)
+    source = tmp_path / "source.pcap"
+    growing = tmp_path / "growing.pcap"
+    write_pcap(source, [echo_request_frame(mac) for mac in neighbor_macs])
+
+    events = []
+    expired = threading.Event()
+
+    # Function recording table changes and noticing when the table has emptied itself
+    def on_change(event, ipv6, mac):
+        events.append((event, mac))
+        if event == "expired":
+            expired.set()
+
+    table = tcpdump.NeighborTable(max_entries=2, ttl=0.5, on_change=on_change)
+    stop_event = threading.Event()
+    follower = threading.Thread(target=tcpdump.follow_capture, args=(str(growing), table, stop_event))
+    follower.start()
+    try:
+        assert tcpdump.replay_pcap(str(source), str(growing), rate=20) == len(neighbor_macs)
+        replayed = time.monotonic()
+        assert expired.wait(5), "idle capture never expired its neighbors"
+        assert time.monotonic() - replayed >= 0.4  # Not before the TTL ran out
+        deadline = time.monotonic() + 5
+        while len(table) and time.monotonic() < deadline:
+            time.sleep(0.05)
+    finally:
+        stop_event.set()
+        follower.join(5)
+
+    assert [event for event in events if event[0] != "expired"] == [
+        ("new", neighbor_macs[0]),
+        ("new", neighbor_macs[1]),
+        ("new", neighbor_macs[2]),
+        ("evicted", neighbor_macs[0])  # Size cap of two
+    ]
+    assert sorted(event for event in events if event[0] == "expired") == [("expired", neighbor_macs[1]), ("expired", neighbor_macs[2])]
+    assert len(table) == 0
+
+def test_pcapng_goes_through_the_prefilter(tmp_path, monkeypatch):
+    echo = echo_request_frame(neighbor_macs[0])
+    reply = echo[:54] + b"\x81" + echo[55:]
+    path = tmp_path / "capture.pcapng"
+    write_pcapng(path, [reply, echo, reply])
+    with open(path, "rb") as f:
+        assert list(tcpdump.iter_capture_records(f)) == [(tcpdump.linktype_ethernet, frame) for frame in (reply, echo, reply)]
+
+    dissected = []
+    monkeypatch.setattr(tcpdump, "dissect", lambda linktype, data: dissected.append(data))
+    monkeypatch.setattr(tcpdump, "process_packet", lambda pkt, sources: None)
+    assert tcpdump.read_capture(str(path), verbose=False) == ({}, 3)
+    assert dissected == [echo]  # Only the Echo Request is dissected
+
+def test_follow_rejects_pcapng(tmp_path, capsys):
+    path = tmp_path / "capture.pcapng"
+    write_pcapng(path, [echo_request_frame(neighbor_macs[0])])
+    assert tcpdump.main([str(path), "--follow"]) == 1
+    assert "[ERROR]" in capsys.readouterr().out